@@ -20,6 +20,27 @@ from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import hashlib
+import functools
+import importlib.util
+import re
+
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
 
 # Configuration
 CHECKPOINT_INTERVAL = 1800  # 30 minutes
@@ -27,81 +48,217 @@ MANIFEST_UPDATE_DELAY = 5   # 5 seconds after changes stop
 COMMIT_BATCH_SIZE = 50       # Commit after 50 file changes
 PR_THRESHOLD = 200           # Create PR after 200 changes
 
+# Paths containing any of these are never treated as project changes.
+# .claude/manifests/ is our own output; watching it would re-trigger updates.
+IGNORE_PATTERNS = [
+    '.git/', 'node_modules/', '.claude/automation/', '.claude/manifests/',
+    '__pycache__/', '.pytest_cache/', '.next/'
+]
+IGNORE_RE = re.compile('|'.join(re.escape(p) for p in IGNORE_PATTERNS))
+
+@functools.lru_cache(maxsize=4096)
+def normalize_path(path):
+    """Canonical absolute path for an event path, or None if it is ignored"""
+    if IGNORE_RE.search(path):
+        return None
+    return os.path.abspath(path)
+
 class RealTimeAutomation:
     def __init__(self, project_path=None):
         self.project_path = Path(project_path or os.getcwd())
+        # Wall-clock times are only persisted; deadlines use the monotonic clock
         self.last_checkpoint = datetime.now()
-        self.last_manifest_update = datetime.now()
+        self.last_checkpoint_mono = time.monotonic()
+        self.last_manifest_update = self.last_checkpoint
         self.pending_changes = set()
         self.change_count = 0
         self.running = True
-        self.manifest_timer = None
+        self.manifest_deadline = None
+        self.manifest_cv = threading.Condition()
+        self.checkpoint_timer = None
+        # Checkpoints run from the observer and timer threads; one lock covers the
+        # commit and the timer swap (reentrant: a checkpoint re-arms the timer)
+        self.checkpoint_lock = threading.RLock()
+        self._last_saved_state = None
         self.checkpoint_file = Path.home() / '.claude' / 'automation' / 'state.json'
+        self.repo = self.open_repository()
+        self.updater = self.load_manifest_updater()
+        self._ref_fingerprint = None
         self.load_state()
         
+    def open_repository(self):
+        """Open the project repository in-process when pygit2 is available"""
+        if not PYGIT2_AVAILABLE:
+            return None
+        try:
+            return pygit2.Repository(str(self.project_path))
+        except (pygit2.GitError, KeyError):
+            return None
+        
     def load_state(self):
         """Load saved automation state"""
         self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
         if self.checkpoint_file.exists():
-            with open(self.checkpoint_file) as f:
-                state = json.load(f)
-                self.last_checkpoint = datetime.fromisoformat(state.get('last_checkpoint', datetime.now().isoformat()))
-                self.change_count = state.get('change_count', 0)
+            with open(self.checkpoint_file, 'rb') as f:
+                data = f.read()
+            state = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+            if 'last_checkpoint' in state:
+                self.last_checkpoint = datetime.fromisoformat(state['last_checkpoint'])
+                age = (datetime.now() - self.last_checkpoint).total_seconds()
+                self.last_checkpoint_mono = time.monotonic() - max(0, age)
+            self.change_count = state.get('change_count', 0)
     
     def save_state(self):
         """Save automation state"""
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump({
-                'last_checkpoint': self.last_checkpoint.isoformat(),
-                'last_manifest_update': self.last_manifest_update.isoformat(),
-                'change_count': self.change_count,
-                'project': str(self.project_path)
-            }, f, indent=2)
+        state = {
+            'last_checkpoint': self.last_checkpoint.isoformat(),
+            'last_manifest_update': self.last_manifest_update.isoformat(),
+            'change_count': self.change_count,
+            'project': str(self.project_path)
+        }
+        if ORJSON_AVAILABLE:
+            blob = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+        else:
+            blob = json.dumps(state, indent=2).encode('utf-8')
+        if blob == self._last_saved_state:
+            return
+        
+        # Write a temp file and rename over the old state so a crash never leaves it torn
+        tmp_path = f"{self.checkpoint_file}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, blob)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.checkpoint_file)
+        self._last_saved_state = blob
+    
+    def load_manifest_updater(self):
+        """Load SmartManifestUpdater in-process (None falls back to a subprocess)"""
+        module_path = Path(__file__).resolve().parent / 'smart-manifest-update.py'
+        try:
+            spec = importlib.util.spec_from_file_location('smart_manifest_update', module_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module.SmartManifestUpdater(self.project_path)
+        except Exception as e:
+            print(f"⚠️ In-process manifest updater unavailable: {e}")
+            return None
+    
+    def run_manifest_update(self, changed):
+        """Run the manifest updater, returning True on success"""
+        # The in-process updater keeps its tree listing between runs, so only
+        # the changed paths are re-classified
+        if self.updater is not None:
+            self.updater.update_all(incremental=True, preserve_manual=True, changed_files=changed)
+            return True
+        
+        # Use our smart manifest update command
+        result = subprocess.run([
+            'python3',
+            str(Path.home() / '.claude' / 'automation' / 'smart-manifest-update.py'),
+            '--incremental',
+            '--preserve-manual'
+        ], cwd=self.project_path, capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            print(f"⚠️ Manifest update warning: {result.stderr}")
+            return False
+        return True
     
     def update_manifests(self):
         """Update all manifests intelligently"""
-        print(f"📊 Updating manifests for {len(self.pending_changes)} changes...")
+        changed = list(self.pending_changes)
+        print(f"📊 Updating manifests for {len(changed)} changes...")
         
         try:
-            # Use our smart manifest update command
-            result = subprocess.run([
-                'python3',
-                str(Path.home() / '.claude' / 'automation' / 'smart-manifest-update.py'),
-                '--incremental',
-                '--preserve-manual'
-            ], cwd=self.project_path, capture_output=True, text=True)
-            
-            if result.returncode == 0:
+            if self.run_manifest_update(changed):
                 print("✅ Manifests updated successfully")
                 self.last_manifest_update = datetime.now()
-                self.pending_changes.clear()
-            else:
-                print(f"⚠️ Manifest update warning: {result.stderr}")
+                self.pending_changes.difference_update(changed)
         except Exception as e:
             print(f"❌ Manifest update error: {e}")
     
+    def get_change_summary(self):
+        """Return (added, modified, deleted) counts or None if clean"""
+        if self.repo is not None:
+            status = self.repo.status()
+            added = modified = deleted = 0
+            for flags in status.values():
+                if flags & (pygit2.GIT_STATUS_WT_NEW | pygit2.GIT_STATUS_INDEX_NEW):
+                    added += 1
+                elif flags & (pygit2.GIT_STATUS_WT_MODIFIED | pygit2.GIT_STATUS_INDEX_MODIFIED):
+                    modified += 1
+                elif flags & (pygit2.GIT_STATUS_WT_DELETED | pygit2.GIT_STATUS_INDEX_DELETED):
+                    deleted += 1
+            if not (added or modified or deleted):
+                return None
+            return added, modified, deleted
+        
+        result = subprocess.run(
+            ['git', 'status', '--porcelain'],
+            cwd=self.project_path,
+            capture_output=True,
+            text=True
+        )
+        
+        if not result.stdout.strip():
+            return None
+        
+        # One pass over the two status columns of each line
+        added = modified = deleted = 0
+        for line in result.stdout.splitlines():
+            index_status, worktree_status = line[0], line[1]
+            if index_status in 'A?':
+                added += 1
+            elif index_status == 'M' or worktree_status == 'M':
+                modified += 1
+            elif index_status == 'D' or worktree_status == 'D':
+                deleted += 1
+        return added, modified, deleted
+    
+    def commit_all(self, message):
+        """Stage everything and commit, in-process when possible"""
+        if self.repo is not None:
+            index = self.repo.index
+            index.add_all()
+            index.write()
+            tree = index.write_tree()
+            signature = self.repo.default_signature
+            parents = [] if self.repo.head_is_unborn else [self.repo.head.target]
+            self.repo.create_commit('HEAD', signature, signature, message, tree, parents)
+            return True
+        
+        # Stage all changes
+        subprocess.run(['git', 'add', '-A'], cwd=self.project_path)
+        
+        # Commit
+        result = subprocess.run(
+            ['git', 'commit', '-m', message, '--no-verify'],
+            cwd=self.project_path,
+            capture_output=True
+        )
+        return result.returncode == 0
+    
     def create_checkpoint(self):
         """Create git checkpoint commit"""
+        with self.checkpoint_lock:
+            return self._create_checkpoint()
+    
+    def _create_checkpoint(self):
+        """Create the checkpoint commit; the caller holds checkpoint_lock"""
         try:
             # Check for changes
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=self.project_path,
-                capture_output=True,
-                text=True
-            )
-            
-            if not result.stdout.strip():
+            summary_counts = self.get_change_summary()
+            if summary_counts is None:
                 return False
             
-            # Count changes
-            changes = result.stdout.strip().split('\n')
-            added = len([l for l in changes if l.startswith('A ') or l.startswith('?? ')])
-            modified = len([l for l in changes if l.startswith('M ')])
-            deleted = len([l for l in changes if l.startswith('D ')])
+            added, modified, deleted = summary_counts
             
             # Generate commit message
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+            now = datetime.now()
+            timestamp = now.strftime('%Y-%m-%d %H:%M')
             summary = []
             if added: summary.append(f"{added} new")
             if modified: summary.append(f"{modified} modified")
@@ -109,22 +266,16 @@ class RealTimeAutomation:
             
             message = f"checkpoint: {', '.join(summary)} files - {timestamp}"
             
-            # Stage all changes
-            subprocess.run(['git', 'add', '-A'], cwd=self.project_path)
-            
-            # Commit
-            result = subprocess.run(
-                ['git', 'commit', '-m', message, '--no-verify'],
-                cwd=self.project_path,
-                capture_output=True
-            )
-            
-            if result.returncode == 0:
+            if self.commit_all(message):
                 print(f"✅ Checkpoint created: {message}")
-                self.last_checkpoint = datetime.now()
+                self.last_checkpoint = now
+                self.last_checkpoint_mono = time.monotonic()
                 self.change_count = 0
                 self.save_state()
                 
+                # Batch and periodic checkpoints share one timer; push it back
+                self.schedule_checkpoint()
+                
                 # Check if we should create PR
                 self.check_pr_threshold()
                 return True
@@ -134,18 +285,48 @@ class RealTimeAutomation:
         
         return False
     
+    def get_ref_fingerprint(self):
+        """Fingerprint HEAD and origin/main via ref file mtimes (None if unknown)"""
+        git_dir = Path(self.repo.path) if self.repo is not None else self.project_path / '.git'
+        if not git_dir.is_dir():
+            return None
+        
+        fingerprint = []
+        for ref_file in ('HEAD', 'logs/HEAD', 'refs/remotes/origin/main', 'packed-refs'):
+            try:
+                fingerprint.append(os.stat(git_dir / ref_file).st_mtime_ns)
+            except OSError:
+                fingerprint.append(0)
+        return tuple(fingerprint)
+    
+    def count_unmerged_commits(self):
+        """Count commits on HEAD that are not on origin/main"""
+        if self.repo is not None:
+            upstream = self.repo.references.get('refs/remotes/origin/main')
+            if upstream is None or self.repo.head_is_unborn:
+                return 0
+            ahead, _ = self.repo.ahead_behind(self.repo.head.target, upstream.target)
+            return ahead
+        
+        result = subprocess.run(
+            ['git', 'rev-list', '--count', 'origin/main..HEAD'],
+            cwd=self.project_path,
+            capture_output=True,
+            text=True
+        )
+        return int(result.stdout.strip())
+    
     def check_pr_threshold(self):
         """Check if we should create a PR"""
         try:
-            # Count commits since last PR
-            result = subprocess.run(
-                ['git', 'rev-list', '--count', 'origin/main..HEAD'],
-                cwd=self.project_path,
-                capture_output=True,
-                text=True
-            )
+            # Skip the count entirely while HEAD and origin/main haven't moved
+            fingerprint = self.get_ref_fingerprint()
+            if fingerprint is not None and fingerprint == self._ref_fingerprint:
+                return
             
-            commit_count = int(result.stdout.strip())
+            # Count commits since last PR
+            commit_count = self.count_unmerged_commits()
+            self._ref_fingerprint = fingerprint
             
             if commit_count >= 10:  # Create PR after 10 commits
                 print("🚀 Creating PR for accumulated changes...")
@@ -183,23 +364,53 @@ class RealTimeAutomation:
     
     def schedule_manifest_update(self):
         """Schedule manifest update after changes settle"""
-        if self.manifest_timer:
-            self.manifest_timer.cancel()
-        
-        self.manifest_timer = threading.Timer(MANIFEST_UPDATE_DELAY, self.update_manifests)
-        self.manifest_timer.start()
+        with self.manifest_cv:
+            idle = self.manifest_deadline is None
+            self.manifest_deadline = time.monotonic() + MANIFEST_UPDATE_DELAY
+            if idle:
+                # Only an idle worker needs waking; a waiting one re-checks the deadline
+                self.manifest_cv.notify()
     
-    def periodic_checkpoint(self):
-        """Run periodic checkpoints"""
+    def manifest_update_loop(self):
+        """Run manifest updates once the debounce deadline passes"""
         while self.running:
-            time_since_checkpoint = datetime.now() - self.last_checkpoint
+            with self.manifest_cv:
+                if self.manifest_deadline is None:
+                    self.manifest_cv.wait()
+                    continue
+                remaining = self.manifest_deadline - time.monotonic()
+                if remaining > 0:
+                    self.manifest_cv.wait(remaining)
+                    continue
+                self.manifest_deadline = None
+            self.update_manifests()
+    
+    def schedule_checkpoint(self, delay=None):
+        """Arm the periodic checkpoint timer for the next due time"""
+        with self.checkpoint_lock:
+            if self.checkpoint_timer:
+                self.checkpoint_timer.cancel()
+            if not self.running:
+                return
             
-            if time_since_checkpoint.total_seconds() >= CHECKPOINT_INTERVAL:
-                print(f"\n⏰ Periodic checkpoint (30 minutes)...")
-                self.create_checkpoint()
+            if delay is None:
+                elapsed = time.monotonic() - self.last_checkpoint_mono
+                delay = max(0, CHECKPOINT_INTERVAL - elapsed)
             
-            # Check every minute
-            time.sleep(60)
+            self.checkpoint_timer = threading.Timer(delay, self.on_checkpoint_tick)
+            self.checkpoint_timer.daemon = True
+            self.checkpoint_timer.start()
+    
+    def on_checkpoint_tick(self):
+        """Run a periodic checkpoint when the timer fires"""
+        with self.checkpoint_lock:
+            # A timer that fired while another thread re-armed it has been replaced
+            if threading.current_thread() is not self.checkpoint_timer:
+                return
+            print(f"\n⏰ Periodic checkpoint (30 minutes)...")
+            if not self._create_checkpoint():
+                # Nothing to commit; try again a full interval from now
+                self.schedule_checkpoint(CHECKPOINT_INTERVAL)
     
     def start(self):
         """Start the automation system"""
@@ -209,16 +420,18 @@ class RealTimeAutomation:
         print(f"📊 Manifests: Update on file changes")
         print("-" * 50)
         
-        # Start file watcher
+        # Start file watcher (batched inotify on Linux, watchdog elsewhere)
         event_handler = FileChangeHandler(self)
-        observer = Observer()
-        observer.schedule(event_handler, str(self.project_path), recursive=True)
+        if INOTIFY_AVAILABLE:
+            observer = InotifyObserver(event_handler, str(self.project_path))
+        else:
+            observer = Observer()
+            observer.schedule(event_handler, str(self.project_path), recursive=True)
+            threading.Thread(target=self.manifest_update_loop, daemon=True).start()
         observer.start()
         
-        # Start periodic checkpoint thread
-        checkpoint_thread = threading.Thread(target=self.periodic_checkpoint)
-        checkpoint_thread.daemon = True
-        checkpoint_thread.start()
+        # Arm the periodic checkpoint timer (no polling thread)
+        self.schedule_checkpoint()
         
         try:
             while self.running:
@@ -233,8 +446,11 @@ class RealTimeAutomation:
         """Stop the automation system"""
         print("\n🛑 Stopping automation system...")
         self.running = False
-        if self.manifest_timer:
-            self.manifest_timer.cancel()
+        with self.manifest_cv:
+            self.manifest_cv.notify_all()
+        with self.checkpoint_lock:
+            if self.checkpoint_timer:
+                self.checkpoint_timer.cancel()
         self.save_state()
 
 class FileChangeHandler(FileSystemEventHandler):
@@ -242,41 +458,128 @@ class FileChangeHandler(FileSystemEventHandler):
     
     def __init__(self, automation):
         self.automation = automation
-        self.ignore_patterns = [
-            '.git/', 'node_modules/', '.claude/automation/',
-            '__pycache__/', '.pytest_cache/', '.next/'
-        ]
+        self.ignore_patterns = IGNORE_PATTERNS
     
     def should_ignore(self, path):
         """Check if path should be ignored"""
-        path_str = str(path)
-        return any(pattern in path_str for pattern in self.ignore_patterns)
+        return IGNORE_RE.search(str(path)) is not None
     
     def on_modified(self, event):
-        if not event.is_directory and not self.should_ignore(event.src_path):
-            self.handle_change(event.src_path)
+        self.on_file_event(event)
     
     def on_created(self, event):
-        if not event.is_directory and not self.should_ignore(event.src_path):
-            self.handle_change(event.src_path)
+        self.on_file_event(event)
     
     def on_deleted(self, event):
-        if not event.is_directory and not self.should_ignore(event.src_path):
-            self.handle_change(event.src_path)
+        self.on_file_event(event)
+    
+    def on_moved(self, event):
+        self.on_file_event(event, event.dest_path)
     
-    def handle_change(self, path):
-        """Handle a file change"""
-        self.automation.pending_changes.add(path)
-        self.automation.change_count += 1
+    def on_file_event(self, event, *extra_paths):
+        """Normalize once (memoized for rapid rewrites) and record the change"""
+        # Directory paths go through as well: the manifest updater re-walks
+        # them, or drops everything recorded below one that is gone
+        suffix = os.sep if event.is_directory else ''
+        paths = [normalize_path(p + suffix) for p in (event.src_path, *extra_paths)]
+        paths = [p for p in paths if p is not None]
+        if paths:
+            self.handle_changes(paths)
+    
+    def handle_changes(self, paths):
+        """Handle file changes from one event"""
+        self.record_changes(paths)
         
         # Schedule manifest update (debounced)
         self.automation.schedule_manifest_update()
+    
+    def record_changes(self, paths):
+        """Record a batch of changed paths"""
+        self.automation.pending_changes.update(paths)
+        self.automation.change_count += len(paths)
         
         # Check if we should checkpoint based on change count
         if self.automation.change_count >= COMMIT_BATCH_SIZE:
             print(f"\n📦 Batch checkpoint ({COMMIT_BATCH_SIZE} changes)...")
             self.automation.create_checkpoint()
 
+class InotifyObserver(threading.Thread):
+    """Linux inotify watcher that drains events in batches
+    
+    Replaces the watchdog Observer: every wakeup handles all queued events
+    at once, and the read timeout doubles as the manifest debounce so no
+    per-event Timer is needed.
+    """
+    
+    def __init__(self, handler, path):
+        super().__init__(daemon=True)
+        self.handler = handler
+        self.root = path
+        self.inotify = INotify()
+        self.watches = {}
+        self.running = True
+        self.watch_flags = (
+            inotify_flags.CREATE | inotify_flags.MODIFY | inotify_flags.DELETE |
+            inotify_flags.MOVED_FROM | inotify_flags.MOVED_TO
+        )
+    
+    def add_tree(self, root):
+        """Watch a directory and every non-ignored directory below it"""
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [
+                d for d in dirnames
+                if not self.handler.should_ignore(os.path.join(dirpath, d) + os.sep)
+            ]
+            try:
+                wd = self.inotify.add_watch(dirpath, self.watch_flags)
+            except OSError:
+                continue  # Vanished or watch limit reached
+            self.watches[wd] = dirpath
+    
+    def run(self):
+        self.add_tree(self.root)
+        dirty = False
+        
+        while self.running:
+            events = self.inotify.read(timeout=MANIFEST_UPDATE_DELAY * 1000)
+            
+            if not events:
+                # Changes have settled for MANIFEST_UPDATE_DELAY seconds
+                if dirty:
+                    dirty = False
+                    self.handler.automation.update_manifests()
+                continue
+            
+            paths = []
+            for event in events:
+                if event.mask & inotify_flags.IGNORED:
+                    self.watches.pop(event.wd, None)
+                    continue
+                
+                parent = self.watches.get(event.wd)
+                if parent is None or not event.name:
+                    continue
+                
+                path = os.path.join(parent, event.name)
+                if event.mask & inotify_flags.ISDIR:
+                    # Record the directory itself: files moved in with it raise no
+                    # events of their own, and a removed one takes its files along
+                    path += os.sep
+                    if (event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO)
+                            and not self.handler.should_ignore(path)):
+                        self.add_tree(path)
+                
+                path = normalize_path(path)
+                if path is not None:
+                    paths.append(path)
+            
+            if paths:
+                dirty = True
+                self.handler.record_changes(paths)
+    
+    def stop(self):
+        self.running = False
+
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
     print("\n🛑 Received shutdown signal...")
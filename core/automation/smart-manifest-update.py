@@ -12,14 +12,56 @@ from pathlib import Path
 from datetime import datetime
 import hashlib
 import argparse
+import fnmatch
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Directories never descended into when scanning the project tree
+SCAN_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.pytest_cache', '.next', 'dist', 'build'}
+
+# Common API route patterns: app.get('/x'), router.post('/x'), @Get('/x')
+ENDPOINT_PATTERN = re.compile(
+    r"(?:(?:app|router)\.(?P<route_method>get|post|put|delete|patch)"
+    r"|@(?P<decorator_method>Get|Post|Put|Delete|Patch))\(['\"](?P<path>[^'\"]+)",
+    re.IGNORECASE
+)
+
+def read_json(path):
+    """Load a JSON file, using orjson when available"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def write_json(path, data, indent=True):
+    """Write a JSON file, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    else:
+        blob = json.dumps(data, indent=2 if indent else None).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(blob)
 
 class SmartManifestUpdater:
     def __init__(self, project_path=None):
         self.project_path = Path(project_path or os.getcwd())
         self.manifest_dir = self.project_path / '.claude' / 'manifests'
         self.manifest_dir.mkdir(parents=True, exist_ok=True)
-        
-    def update_all(self, incremental=True, preserve_manual=True):
+        self.cache_file = self.manifest_dir / '.cache.json'
+        self._scan_cache = None
+        self._session_files = None  # Tree listing walked by this process
+        self._scan_lock = threading.Lock()
+        self._endpoint_cache = {}
+        self._fingerprint_cache = {}
+        
+    def update_all(self, incremental=True, preserve_manual=True, changed_files=None):
         """Update all manifests intelligently"""
         manifests = [
             'project-manifest.json',
@@ -32,11 +74,33 @@ class SmartManifestUpdater:
             'dependencies-manifest.json'
         ]
         
-        results = {}
-        for manifest_name in manifests:
-            result = self.update_manifest(manifest_name, incremental, preserve_manual)
-            results[manifest_name] = result
-        
+        # Marker files drive type detection, so a change to them drops the whole cache
+        markers = self.get_marker_mtimes()
+        cache = self.load_cache()
+        if cache.get('markers') != markers:
+            cache = {}
+        self._endpoint_cache = cache.get('endpoints', {})
+        
+        # Rescan the tree once per run; every generator filters the same listing.
+        # When a long-lived caller knows which paths changed, patch the listing this
+        # process walked earlier instead. A listing saved by another process may
+        # have missed files created while nothing was watching, so it is never reused.
+        self._scan_cache = None
+        if changed_files is not None and self._session_files is not None:
+            self.apply_changed_files(self._session_files, changed_files)
+        
+        # Manifests are independent, so generate them concurrently
+        workers = min(len(manifests), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                manifest_name: executor.submit(self.update_manifest, manifest_name, incremental, preserve_manual)
+                for manifest_name in manifests
+            }
+            results = {manifest_name: future.result() for manifest_name, future in futures.items()}
+        
+        if self._scan_cache is not None:
+            self._session_files = self._scan_cache
+        self.save_cache(markers)
         return results
     
     def update_manifest(self, manifest_name, incremental=True, preserve_manual=True):
@@ -47,10 +111,10 @@ class SmartManifestUpdater:
         # Load existing manifest if it exists
         existing = {}
         if manifest_path.exists():
-            with open(manifest_path) as f:
-                if manifest_name.endswith('.json'):
-                    existing = json.load(f)
-                else:
+            if manifest_name.endswith('.json'):
+                existing = read_json(manifest_path)
+            else:
+                with open(manifest_path) as f:
                     existing = yaml.safe_load(f)
         
         # Generate new data based on type
@@ -71,10 +135,10 @@ class SmartManifestUpdater:
         }
         
         # Save manifest
-        with open(manifest_path, 'w') as f:
-            if manifest_name.endswith('.json'):
-                json.dump(final, f, indent=2)
-            else:
+        if manifest_name.endswith('.json'):
+            write_json(manifest_path, final)
+        else:
+            with open(manifest_path, 'w') as f:
                 yaml.dump(final, f, default_flow_style=False)
         
         return {
@@ -83,6 +147,90 @@ class SmartManifestUpdater:
             'version': final['_metadata']['version']
         }
     
+    def scan_files(self):
+        """Walk the project tree once and cache (rel_path, name, suffix, dirs) records"""
+        with self._scan_lock:
+            if self._scan_cache is None:
+                self._scan_cache = self.walk_tree(str(self.project_path), ())
+            return self._scan_cache
+    
+    def walk_tree(self, root, root_dirs):
+        """List files below root as (rel_path, name, suffix, dirs) records"""
+        files = []
+        stack = [(root, root_dirs)]
+        while stack:
+            dir_path, dirs = stack.pop()
+            try:
+                entries = os.scandir(dir_path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SCAN_SKIP_DIRS:
+                            stack.append((entry.path, dirs + (entry.name,)))
+                    elif entry.is_file():
+                        files.append(self.file_record(dirs, entry.name))
+        return files
+    
+    def file_record(self, dirs, name):
+        """Build the scan record for a file"""
+        rel_path = os.path.join(*dirs, name)
+        suffix = os.path.splitext(name)[1][1:]
+        return (rel_path, name, suffix, dirs)
+    
+    def apply_changed_files(self, cached_files, changed_files):
+        """Patch an earlier tree listing with changed paths instead of rewalking"""
+        root = os.path.abspath(self.project_path)
+        changed = set()
+        for path in changed_files:
+            rel_path = os.path.relpath(os.path.join(root, path), root)
+            if not rel_path.startswith('..'):
+                changed.add(rel_path)
+        
+        # Drop stale records for the changed paths (and anything below them)
+        prefixes = tuple(rel_path + os.sep for rel_path in changed)
+        files = [
+            (rel_path, name, suffix, tuple(dirs))
+            for rel_path, name, suffix, dirs in cached_files
+            if rel_path not in changed and not rel_path.startswith(prefixes)
+        ]
+        
+        # Re-add whatever still exists on disk
+        for rel_path in changed:
+            parts = rel_path.split(os.sep)
+            if any(part in SCAN_SKIP_DIRS for part in parts):
+                continue
+            full_path = os.path.join(root, rel_path)
+            if os.path.isdir(full_path):
+                files.extend(self.walk_tree(full_path, tuple(parts)))
+            elif os.path.isfile(full_path):
+                files.append(self.file_record(tuple(parts[:-1]), parts[-1]))
+        
+        self._scan_cache = files
+    
+    def get_marker_mtimes(self):
+        """mtimes of the files that decide project type (None when missing)"""
+        mtimes = []
+        for marker in ('package.json', 'requirements.txt'):
+            try:
+                mtimes.append(os.stat(self.project_path / marker).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+    
+    def load_cache(self):
+        """Load the persisted per-file endpoint cache"""
+        try:
+            return read_json(self.cache_file)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_cache(self, markers):
+        """Persist the endpoint cache for the next run"""
+        cache = {'markers': markers, 'endpoints': self._endpoint_cache}
+        write_json(self.cache_file, cache, indent=False)
+    
     def generate_manifest_data(self, manifest_type):
         """Generate manifest data based on type"""
         generators = {
@@ -110,30 +258,35 @@ class SmartManifestUpdater:
             'scripts': {}
         }
         
-        # Map directory structure
-        for item in self.project_path.iterdir():
-            if not item.name.startswith('.') and item.is_dir():
-                manifest['structure'][item.name] = self.get_dir_description(item.name)
-        
-        # Find entry points
+        # One listing of the project root serves structure, entry points and config
         entry_files = ['index.js', 'main.py', 'app.js', 'server.js']
-        for entry in entry_files:
-            if (self.project_path / entry).exists():
-                manifest['entryPoints'].append(entry)
-        
-        # Find config files
         config_patterns = ['*.config.js', '*.json', '.env*']
+        config_files = {pattern: [] for pattern in config_patterns}
+        root_names = set()
+        
+        with os.scandir(self.project_path) as entries:
+            for entry in entries:
+                root_names.add(entry.name)
+                
+                # Map directory structure
+                if not entry.name.startswith('.') and entry.is_dir():
+                    manifest['structure'][entry.name] = self.get_dir_description(entry.name)
+                
+                # Find config files
+                if not entry.name.startswith('.git'):
+                    for pattern in config_patterns:
+                        if fnmatch.fnmatch(entry.name, pattern):
+                            config_files[pattern].append(entry.name)
+        
+        # Find entry points
+        manifest['entryPoints'] = [entry for entry in entry_files if entry in root_names]
         for pattern in config_patterns:
-            for config_file in self.project_path.glob(pattern):
-                if not config_file.name.startswith('.git'):
-                    manifest['configuration'].append(str(config_file.relative_to(self.project_path)))
+            manifest['configuration'].extend(config_files[pattern])
         
         # Get package.json scripts if exists
-        package_file = self.project_path / 'package.json'
-        if package_file.exists():
-            with open(package_file) as f:
-                package = json.load(f)
-                manifest['scripts'] = package.get('scripts', {})
+        package = self.read_package_json()
+        if package is not None:
+            manifest['scripts'] = package.get('scripts', {})
         
         return manifest
     
@@ -146,13 +299,25 @@ class SmartManifestUpdater:
             'authentication': {}
         }
         
-        # Find API route files
-        api_patterns = ['**/api/**/*.{js,ts,py}', '**/routes/**/*.{js,ts,py}']
-        for pattern in api_patterns:
-            for api_file in self.project_path.glob(pattern):
-                endpoints = self.extract_endpoints(api_file)
+        # Find API route files, re-reading only those whose mtime changed
+        endpoint_cache = {}
+        for rel_path, name, suffix, dirs in self.scan_files():
+            if suffix in ('js', 'ts', 'py') and ('api' in dirs or 'routes' in dirs):
+                file_path = self.project_path / rel_path
+                try:
+                    mtime = os.stat(file_path).st_mtime_ns
+                except OSError:
+                    continue
+                
+                cached = self._endpoint_cache.get(rel_path)
+                if cached and cached[0] == mtime:
+                    endpoints = cached[1]
+                else:
+                    endpoints = self.extract_endpoints(file_path)
+                endpoint_cache[rel_path] = [mtime, endpoints]
                 manifest['endpoints'].extend(endpoints)
         
+        self._endpoint_cache = endpoint_cache
         return manifest
     
     def generate_database_manifest(self):
@@ -165,10 +330,9 @@ class SmartManifestUpdater:
         }
         
         # Find schema files
-        schema_patterns = ['**/schema.{sql,prisma}', '**/models/**/*.{js,ts,py}']
-        for pattern in schema_patterns:
-            for schema_file in self.project_path.glob(pattern):
-                manifest['schemas'].append(str(schema_file.relative_to(self.project_path)))
+        for rel_path, name, suffix, dirs in self.scan_files():
+            if name in ('schema.sql', 'schema.prisma') or (suffix in ('js', 'ts', 'py') and 'models' in dirs):
+                manifest['schemas'].append(rel_path)
         
         # Find migrations
         migration_dirs = ['migrations', 'db/migrate', 'database/migrations']
@@ -191,22 +355,16 @@ class SmartManifestUpdater:
         }
         
         # Find components
-        component_patterns = [
-            '**/components/**/*.{jsx,tsx,vue}',
-            '**/pages/**/*.{jsx,tsx,vue}',
-            '**/layouts/**/*.{jsx,tsx,vue}'
-        ]
-        
-        for pattern in component_patterns:
-            for component_file in self.project_path.glob(pattern):
-                rel_path = str(component_file.relative_to(self.project_path))
-                
-                if 'components' in rel_path:
-                    manifest['components'].append(rel_path)
-                elif 'pages' in rel_path:
-                    manifest['pages'].append(rel_path)
-                elif 'layouts' in rel_path:
-                    manifest['layouts'].append(rel_path)
+        for rel_path, name, suffix, dirs in self.scan_files():
+            if suffix not in ('jsx', 'tsx', 'vue'):
+                continue
+            
+            if 'components' in dirs:
+                manifest['components'].append(rel_path)
+            elif 'pages' in dirs:
+                manifest['pages'].append(rel_path)
+            elif 'layouts' in dirs:
+                manifest['layouts'].append(rel_path)
         
         return manifest
     
@@ -219,26 +377,26 @@ class SmartManifestUpdater:
         }
         
         # Find test files
-        test_patterns = ['**/*.{spec,test}.{js,ts,jsx,tsx,py}', '**/tests/**/*', '**/__tests__/**/*']
-        for pattern in test_patterns:
-            for test_file in self.project_path.glob(pattern):
-                if 'node_modules' not in str(test_file):
-                    manifest['testFiles'].append(str(test_file.relative_to(self.project_path)))
+        for rel_path, name, suffix, dirs in self.scan_files():
+            name_parts = name.rsplit('.', 2)
+            is_test_name = (
+                len(name_parts) == 3 and name_parts[1] in ('spec', 'test')
+                and suffix in ('js', 'ts', 'jsx', 'tsx', 'py')
+            )
+            if is_test_name or 'tests' in dirs or '__tests__' in dirs:
+                manifest['testFiles'].append(rel_path)
         
         # Get test commands from package.json
-        package_file = self.project_path / 'package.json'
-        if package_file.exists():
-            with open(package_file) as f:
-                package = json.load(f)
-                scripts = package.get('scripts', {})
-                test_scripts = {k: v for k, v in scripts.items() if 'test' in k}
-                manifest['commands'] = test_scripts
+        package = self.read_package_json()
+        if package is not None:
+            scripts = package.get('scripts', {})
+            test_scripts = {k: v for k, v in scripts.items() if 'test' in k}
+            manifest['commands'] = test_scripts
         
         # Try to get coverage
         coverage_file = self.project_path / 'coverage' / 'coverage-summary.json'
         if coverage_file.exists():
-            with open(coverage_file) as f:
-                manifest['coverage'] = json.load(f)
+            manifest['coverage'] = read_json(coverage_file)
         
         return manifest
     
@@ -253,10 +411,8 @@ class SmartManifestUpdater:
         }
         
         # Find auth files
-        auth_patterns = ['**/auth/**/*.{js,ts,py}', '**/security/**/*.{js,ts,py}']
-        for pattern in auth_patterns:
-            for auth_file in self.project_path.glob(pattern):
-                rel_path = str(auth_file.relative_to(self.project_path))
+        for rel_path, name, suffix, dirs in self.scan_files():
+            if suffix in ('js', 'ts', 'py') and ('auth' in dirs or 'security' in dirs):
                 if 'auth' in rel_path.lower():
                     manifest['authentication'][rel_path] = 'Found'
         
@@ -296,13 +452,11 @@ class SmartManifestUpdater:
             'vulnerabilities': []
         }
         
-        # Check package.json
-        package_file = self.project_path / 'package.json'
-        if package_file.exists():
-            with open(package_file) as f:
-                package = json.load(f)
-                manifest['production'] = package.get('dependencies', {})
-                manifest['development'] = package.get('devDependencies', {})
+        # Check package.json (copied: the parsed file is cached and shared)
+        package = self.read_package_json()
+        if package is not None:
+            manifest['production'] = dict(package.get('dependencies', {}))
+            manifest['development'] = dict(package.get('devDependencies', {}))
         
         # Check for requirements.txt
         requirements_file = self.project_path / 'requirements.txt'
@@ -339,30 +493,58 @@ class SmartManifestUpdater:
                 merged[key] = self.merge_dicts(existing[key], value)
             elif isinstance(value, list) and key in existing and isinstance(existing[key], list):
                 # Merge lists (union)
-                merged[key] = list(set(existing[key] + value))
+                merged[key] = self.merge_lists(existing[key], value)
             else:
                 # Replace value
                 merged[key] = value
         
         return merged
     
+    def merge_lists(self, list1, list2):
+        """Union two lists, keeping first-seen order (items may be dicts)"""
+        try:
+            # Plain strings/numbers: ordered dedupe without building list1 + list2
+            return list(dict.fromkeys(chain(list1, list2)))
+        except TypeError:
+            pass
+        
+        seen = {}
+        for item in chain(list1, list2):
+            seen.setdefault(self.list_item_key(item), item)
+        return list(seen.values())
+    
+    def list_item_key(self, item):
+        """Hashable identity for a list item (e.g. an endpoint dict)"""
+        if isinstance(item, dict):
+            try:
+                key = tuple(sorted(item.items()))
+                hash(key)
+                return key
+            except TypeError:
+                return json.dumps(item, sort_keys=True)
+        return item
+    
     def merge_dicts(self, dict1, dict2):
-        """Recursively merge two dictionaries"""
+        """Merge two dictionaries, descending into nested dicts without recursion"""
         result = dict1.copy()
-        for key, value in dict2.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self.merge_dicts(result[key], value)
-            else:
-                result[key] = value
+        stack = [(result, dict2)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    # Copy only the nested dicts we actually write into
+                    merged = current.copy()
+                    target[key] = merged
+                    stack.append((merged, value))
+                else:
+                    target[key] = value
         return result
     
     def count_changes(self, old, new):
         """Count changes between manifests"""
-        # Simple change counter - could be more sophisticated
-        old_json = json.dumps(old, sort_keys=True)
-        new_json = json.dumps(new, sort_keys=True)
-        
-        if old_json == new_json:
+        # Structural comparison exits on the first mismatch, no serialization
+        if old == new:
             return 0
         
         # Count different keys
@@ -375,47 +557,72 @@ class SmartManifestUpdater:
         return added + removed
     
     def flatten_keys(self, d, parent_key=''):
-        """Flatten dictionary keys for comparison"""
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}.{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(self.flatten_keys(v, new_key))
-            else:
-                items.append(new_key)
-        return items
+        """Yield flattened dictionary keys for comparison"""
+        stack = [(parent_key, d)]
+        while stack:
+            prefix, current = stack.pop()
+            for k, v in current.items():
+                new_key = f"{prefix}.{k}" if prefix else k
+                if isinstance(v, dict):
+                    stack.append((new_key, v))
+                else:
+                    yield new_key
     
     def extract_endpoints(self, file_path):
         """Extract API endpoints from file"""
         endpoints = []
         try:
-            with open(file_path) as f:
-                content = f.read()
-                
-                # Simple pattern matching for common API patterns
-                import re
-                patterns = [
-                    r"app\.(get|post|put|delete|patch)\(['\"]([^'\"]+)",
-                    r"router\.(get|post|put|delete|patch)\(['\"]([^'\"]+)",
-                    r"@(Get|Post|Put|Delete|Patch)\(['\"]([^'\"]+)"
-                ]
-                
-                for pattern in patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        method, path = match
-                        endpoints.append({
-                            'method': method.upper(),
-                            'path': path,
-                            'file': str(file_path.relative_to(self.project_path))
-                        })
+            # Only regex-searched, so skip strict UTF-8 validation
+            with open(file_path, 'rb') as f:
+                content = f.read().decode('utf-8', errors='ignore')
+            
+            rel_path = str(file_path.relative_to(self.project_path))
+            for match in ENDPOINT_PATTERN.finditer(content):
+                method = match.group('route_method') or match.group('decorator_method')
+                endpoints.append({
+                    'method': method.upper(),
+                    'path': match.group('path'),
+                    'file': rel_path
+                })
         except Exception:
             pass
         
         return endpoints
     
+    def read_package_json(self):
+        """Parse package.json, reusing the last parse while its mtime and size match"""
+        package_file = self.project_path / 'package.json'
+        try:
+            stat = os.stat(package_file)
+        except OSError:
+            return None
+        
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        cached = self._fingerprint_cache.get('package.json')
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        
+        package = read_json(package_file)
+        self._fingerprint_cache['package.json'] = (fingerprint, package)
+        return package
+    
+    def memoize_on_root(self, name, compute):
+        """Reuse a root-level detection until an entry is added to or removed from the root"""
+        root_mtime = os.stat(self.project_path).st_mtime_ns
+        cached = self._fingerprint_cache.get(name)
+        if cached and cached[0] == root_mtime:
+            return cached[1]
+        
+        value = compute()
+        self._fingerprint_cache[name] = (root_mtime, value)
+        return value
+    
     def detect_project_type(self):
         """Detect project type"""
+        return self.memoize_on_root('project_type', self.find_project_type)
+    
+    def find_project_type(self):
+        """Detect project type from marker files"""
         if (self.project_path / 'package.json').exists():
             return 'JavaScript/TypeScript'
         elif (self.project_path / 'requirements.txt').exists():
@@ -427,6 +634,10 @@ class SmartManifestUpdater:
     
     def detect_database_type(self):
         """Detect database type"""
+        return self.memoize_on_root('database_type', self.find_database_type)
+    
+    def find_database_type(self):
+        """Detect database type from marker directories"""
         if (self.project_path / 'prisma').exists():
             return 'PostgreSQL/Prisma'
         elif (self.project_path / 'migrations').exists():
@@ -436,10 +647,9 @@ class SmartManifestUpdater:
     
     def get_project_name(self):
         """Get project name"""
-        package_file = self.project_path / 'package.json'
-        if package_file.exists():
-            with open(package_file) as f:
-                return json.load(f).get('name', self.project_path.name)
+        package = self.read_package_json()
+        if package is not None:
+            return package.get('name', self.project_path.name)
         return self.project_path.name
     
     def get_dir_description(self, dir_name):
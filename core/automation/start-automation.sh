@@ -47,6 +47,11 @@ check_requirements() {
     # Check/install Python dependencies
     echo "📦 Installing Python dependencies..."
     pip3 install -q watchdog pyyaml 2>/dev/null || true
+    pip3 install -q pygit2 2>/dev/null || true  # optional: in-process git
+    pip3 install -q orjson 2>/dev/null || true  # optional: faster JSON
+    if [[ "$(uname)" == "Linux" ]]; then
+        pip3 install -q inotify_simple 2>/dev/null || true  # optional: batched file watching
+    fi
     
     echo -e "${GREEN}✅ All requirements met${NC}"
 }
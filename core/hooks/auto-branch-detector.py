@@ -8,45 +8,89 @@ import os
 import sys
 import json
 import subprocess
+from datetime import datetime
 from pathlib import Path
 
-# Add git-intelligence to path
-sys.path.insert(0, '/Users/umasankrudhya/claude-automations/git-intelligence/src')
+# git-intelligence is imported lazily, only once a branch decision is needed
+GIT_INTELLIGENCE_SRC = '/Users/umasankrudhya/claude-automations/git-intelligence/src'
 
-from auto_branching import AutoBranchManager
+
+def in_git_repository():
+    """Check for a git repository without running git in the common cases"""
+    known = os.environ.get("CLAUDE_REPO_IS_GIT")
+    if known in ("0", "1"):
+        return known == "1"
+    
+    # .git is a directory in a normal checkout and a file in worktrees
+    if os.path.exists(".git"):
+        return True
+    
+    # Subdirectory of a repository
+    return subprocess.call(
+        ["git", "rev-parse", "--git-dir"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    ) == 0
+
+
+def get_git_status():
+    """Current branch and unstaged tracked changes from a single git status call"""
+    branch = None
+    changed_files = []
+    
+    try:
+        output = subprocess.check_output(
+            ["git", "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=no"],
+            stderr=subprocess.DEVNULL
+        )
+    except subprocess.CalledProcessError:
+        return branch, changed_files
+    
+    # Parse the raw bytes; only the branch name and paths are decoded
+    records = iter(output.split(b'\0'))
+    for record in records:
+        if record.startswith(b"# branch.head "):
+            head = os.fsdecode(record[len(b"# branch.head "):])
+            branch = "HEAD" if head == "(detached)" else head
+        elif record.startswith(b"1 "):
+            fields = record.split(b" ", 8)
+            if fields[1][1:] != b".":  # Same files as `git diff --name-only`
+                changed_files.append(os.fsdecode(fields[8]))
+        elif record.startswith(b"2 "):
+            fields = record.split(b" ", 9)
+            next(records, None)  # Skip the rename source path
+            if fields[1][1:] != b".":
+                changed_files.append(os.fsdecode(fields[9]))
+        elif record.startswith(b"u "):
+            changed_files.append(os.fsdecode(record.split(b" ", 10)[10]))
+    
+    return branch, changed_files
 
 
 def get_claude_context():
     """Get context from Claude environment"""
     context = {
         "changed_files": [],
+        "current_branch": None,
         "current_task": os.environ.get("CLAUDE_CURRENT_TASK", ""),
         "last_commit_msg": "",
         "new_feature": False,
         "fixing_bug": False
     }
     
-    # Get changed files
+    # Get current branch and changed files
     try:
-        result = subprocess.run(
-            ["git", "diff", "--name-only"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            context["changed_files"] = [f for f in result.stdout.strip().split('\n') if f]
+        context["current_branch"], context["changed_files"] = get_git_status()
     except:
         pass
     
     # Get last commit message
     try:
-        result = subprocess.run(
+        output = subprocess.check_output(
             ["git", "log", "-1", "--pretty=%B"],
-            capture_output=True,
-            text=True
+            stderr=subprocess.DEVNULL
         )
-        if result.returncode == 0:
-            context["last_commit_msg"] = result.stdout.strip()
+        context["last_commit_msg"] = output.decode("utf-8", "replace").strip()
     except:
         pass
     
@@ -65,6 +109,10 @@ def main():
         if os.environ.get("CLAUDE_DISABLE_AUTO_BRANCH") == "true":
             return
         
+        # Nothing to branch outside a repository; skip the git calls below
+        if not in_git_repository():
+            return
+        
         # Get context
         context = get_claude_context()
         
@@ -73,22 +121,24 @@ def main():
             return
         
         # Initialize branch manager
+        sys.path.insert(0, GIT_INTELLIGENCE_SRC)
+        from auto_branching import AutoBranchManager
         manager = AutoBranchManager()
         
-        # Check current branch
-        current_branch = manager.get_current_branch()
+        # Check current branch (already read by the status call)
+        current_branch = context["current_branch"] or manager.get_current_branch()
         
         # Only create branch if on main/master/develop
         if current_branch not in ["main", "master", "develop"]:
             # Check if we should suggest merge
-            merge_suggestion = manager.suggest_branch_merge()
+            merge_suggestion = manager.suggest_branch_merge(current_branch)
             if merge_suggestion:
                 print(f"\n💡 Branch '{merge_suggestion['branch']}' has {merge_suggestion['commits']} commits")
                 print("   Consider creating a PR with /pr command")
             return
         
         # Attempt auto-branching
-        new_branch = manager.auto_branch(context)
+        new_branch = manager.auto_branch(context, current_branch)
         
         if new_branch:
             print(f"\n🌿 Auto-created branch: {new_branch}")
@@ -97,7 +147,7 @@ def main():
             
             # Log the action
             log_entry = {
-                "timestamp": subprocess.run(["date", "-Iseconds"], capture_output=True, text=True).stdout.strip(),
+                "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
                 "action": "auto_branch",
                 "branch": new_branch,
                 "context": {
@@ -106,12 +156,12 @@ def main():
                 }
             }
             
-            # Write to log
+            # Write to log (hook_logger is only imported once there is something to log)
+            from hook_logger import append_log
             log_file = Path.home() / ".claude" / "smart-genie-auto-branch.log"
             log_file.parent.mkdir(exist_ok=True)
             
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + "\n")
+            append_log(log_file, json.dumps(log_entry) + "\n")
                 
     except Exception as e:
         # Silent failure - don't interrupt Claude's workflow
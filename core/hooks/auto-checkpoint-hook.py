@@ -8,81 +8,168 @@ import time
 import json
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import threading
 import signal
 
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
 CHECKPOINT_INTERVAL = 1800  # 30 minutes in seconds
 CHECKPOINT_FILE = Path.home() / '.claude' / 'last_checkpoint.json'
 
+# (prefix, description, substrings) in priority order; a file counts for the first rule it matches
+COMMIT_RULES = [
+    ('ci', 'Update CI/CD workflows', ('.github/workflows',)),
+    ('test', 'Update test files', ('test',)),
+    ('docs', 'Update documentation', ('doc', '.md')),
+    ('feat', 'Update automation hooks', ('hook',)),
+    ('feat', 'Update code intelligence manifests', ('manifest',)),
+]
+
+def porcelain_code(flags):
+    """Translate pygit2 status flags into a porcelain XY code"""
+    if flags & pygit2.GIT_STATUS_WT_NEW and not flags & pygit2.GIT_STATUS_INDEX_NEW:
+        return '??'
+    # libgit2 reports unmerged paths with a single flag; git shows them as UU, AA, DU...
+    if flags & pygit2.GIT_STATUS_CONFLICTED:
+        return 'UU'
+    
+    index = ' '
+    if flags & pygit2.GIT_STATUS_INDEX_NEW:
+        index = 'A'
+    elif flags & pygit2.GIT_STATUS_INDEX_MODIFIED:
+        index = 'M'
+    elif flags & pygit2.GIT_STATUS_INDEX_DELETED:
+        index = 'D'
+    elif flags & pygit2.GIT_STATUS_INDEX_RENAMED:
+        index = 'R'
+    elif flags & pygit2.GIT_STATUS_INDEX_TYPECHANGE:
+        index = 'T'
+    
+    worktree = ' '
+    if flags & pygit2.GIT_STATUS_WT_MODIFIED:
+        worktree = 'M'
+    elif flags & pygit2.GIT_STATUS_WT_DELETED:
+        worktree = 'D'
+    elif flags & pygit2.GIT_STATUS_WT_RENAMED:
+        worktree = 'R'
+    elif flags & pygit2.GIT_STATUS_WT_TYPECHANGE:
+        worktree = 'T'
+    
+    return index + worktree
+
 class AutoCheckpointer:
     def __init__(self):
         self.last_checkpoint = self.load_last_checkpoint()
         self.running = True
+        self._repo_state = None
+        self.repo = self.open_repository()
+    
+    def open_repository(self):
+        """Open the repository in-process when pygit2 is available"""
+        if not PYGIT2_AVAILABLE:
+            return None
+        try:
+            return pygit2.Repository('.')
+        except (pygit2.GitError, KeyError):
+            return None
         
     def load_last_checkpoint(self):
-        """Load the timestamp of the last checkpoint"""
+        """Load the last checkpoint as a time.monotonic() value"""
+        epoch = None
         if CHECKPOINT_FILE.exists():
             with open(CHECKPOINT_FILE) as f:
                 data = json.load(f)
-                return datetime.fromisoformat(data.get('timestamp', ''))
-        return datetime.now() - timedelta(hours=1)  # Force immediate checkpoint
+            epoch = data.get('epoch')
+            if epoch is None and data.get('timestamp'):
+                # Files written before 'epoch' was stored only have the ISO string
+                epoch = datetime.fromisoformat(data['timestamp']).timestamp()
+        if epoch is None:
+            return time.monotonic() - 2 * CHECKPOINT_INTERVAL  # Force immediate checkpoint
+        # Rebase the wall-clock age onto the monotonic clock once, at load
+        return time.monotonic() - (time.time() - epoch)
     
-    def save_checkpoint_time(self):
+    def save_checkpoint_time(self, commit_hash=None):
         """Save the current time as last checkpoint"""
+        epoch = time.time()
         CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
         with open(CHECKPOINT_FILE, 'w') as f:
             json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'commit_hash': self.get_last_commit_hash()
+                'epoch': epoch,
+                'timestamp': datetime.fromtimestamp(epoch).isoformat(),
+                'commit_hash': commit_hash or self.get_last_commit_hash()
             }, f)
+        self.last_checkpoint = time.monotonic()
     
     def get_last_commit_hash(self):
         """Get the hash of the last commit"""
+        if self.repo is not None:
+            if self.repo.head_is_unborn:
+                return 'unknown'
+            return str(self.repo.head.target)[:7]  # Short hash
+        
         try:
-            result = subprocess.run(
+            output = subprocess.check_output(
                 ['git', 'rev-parse', 'HEAD'],
-                capture_output=True,
-                text=True,
-                check=True
+                stderr=subprocess.DEVNULL
             )
-            return result.stdout.strip()[:7]  # Short hash
+            return output[:7].decode('ascii')  # Short hash
         except subprocess.CalledProcessError:
             return 'unknown'
     
+    def get_repo_state(self):
+        """Map each changed path to its porcelain XY code (one git status per checkpoint)"""
+        if self._repo_state is None and self.repo is not None:
+            # libgit2 reads the index directly; no git process is spawned
+            state = {}
+            for path, flags in self.repo.status().items():
+                code = porcelain_code(flags)
+                if code != '  ':
+                    state[path] = code
+            self._repo_state = state
+        
+        if self._repo_state is None:
+            output = subprocess.check_output(
+                ['git', 'status', '--porcelain=v1', '-z', '--untracked-files=all'],
+                stderr=subprocess.DEVNULL
+            )
+            
+            # Parse the raw bytes; only the paths are decoded
+            state = {}
+            records = iter(output.split(b'\0'))
+            for record in records:
+                if not record:
+                    continue
+                xy = record[:2].decode('ascii')
+                state[os.fsdecode(record[3:])] = xy
+                if xy[0] in 'RC':
+                    next(records, None)  # Skip the rename/copy source path
+            self._repo_state = state
+        return self._repo_state
+    
     def has_changes(self):
         """Check if there are uncommitted changes"""
         try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip() != ''
+            return bool(self.get_repo_state())
         except subprocess.CalledProcessError:
             return False
     
     def get_change_summary(self):
         """Generate a summary of changes"""
         try:
-            # Get list of modified files
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            lines = result.stdout.strip().split('\n')
-            if not lines or lines == ['']:
+            codes = self.get_repo_state().values()
+            if not codes:
                 return "No changes"
             
             # Count changes by type
-            added = len([l for l in lines if l.startswith('A ') or l.startswith('?? ')])
-            modified = len([l for l in lines if l.startswith('M ') or l.startswith(' M')])
-            deleted = len([l for l in lines if l.startswith('D ')])
+            added = len([c for c in codes if c == 'A ' or c == '??'])
+            modified = len([c for c in codes if c == 'M ' or c == ' M'])
+            deleted = len([c for c in codes if c == 'D '])
             
             summary_parts = []
             if added:
@@ -100,32 +187,18 @@ class AutoCheckpointer:
     def generate_semantic_commit_message(self):
         """Generate a semantic commit message based on changes"""
         try:
-            # Check what files were changed
-            result = subprocess.run(
-                ['git', 'diff', '--name-only'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            changed_files = result.stdout.strip().split('\n')
+            # Classify each changed file once and let the most common kind win
+            counts = [0] * len(COMMIT_RULES)
+            for path in map(str.lower, self.get_repo_state()):
+                for i, (_, _, substrings) in enumerate(COMMIT_RULES):
+                    if any(s in path for s in substrings):
+                        counts[i] += 1
+                        break
             
-            # Determine commit type based on changed files
-            if any('.github/workflows' in f for f in changed_files):
-                prefix = 'ci'
-                desc = 'Update CI/CD workflows'
-            elif any('test' in f.lower() for f in changed_files):
-                prefix = 'test'
-                desc = 'Update test files'
-            elif any('doc' in f.lower() or '.md' in f for f in changed_files):
-                prefix = 'docs'
-                desc = 'Update documentation'
-            elif any('hook' in f for f in changed_files):
-                prefix = 'feat'
-                desc = 'Update automation hooks'
-            elif any('manifest' in f for f in changed_files):
-                prefix = 'feat'
-                desc = 'Update code intelligence manifests'
+            # Ties go to the earlier rule
+            best = max(range(len(COMMIT_RULES)), key=counts.__getitem__)
+            if counts[best]:
+                prefix, desc, _ = COMMIT_RULES[best]
             else:
                 prefix = 'chore'
                 desc = self.get_change_summary()
@@ -138,27 +211,37 @@ class AutoCheckpointer:
     
     def create_checkpoint_commit(self):
         """Create a checkpoint commit"""
+        # Status is read once for this attempt and shared by every step below
+        self._repo_state = None
+        try:
+            return self.commit_checkpoint()
+        finally:
+            self._repo_state = None
+    
+    def commit_checkpoint(self):
+        """Stage and commit using the cached repository state"""
         if not self.has_changes():
             print("📝 No changes to checkpoint")
             return False
         
         try:
+            # Describe the changes before staging alters their status codes
+            message = self.generate_semantic_commit_message()
+            summary = self.get_change_summary()
+            
             # Stage all changes
             subprocess.run(['git', 'add', '-A'], check=True)
             
-            # Generate commit message
-            message = self.generate_semantic_commit_message()
-            
             # Create commit
             result = subprocess.run([
                 'git', 'commit', '-m', 
-                f"{message}\n\n🔄 Auto-checkpoint\n{self.get_change_summary()}"
+                f"{message}\n\n🔄 Auto-checkpoint\n{summary}"
             ], capture_output=True, text=True)
             
             if result.returncode == 0:
                 commit_hash = self.get_last_commit_hash()
                 print(f"✅ Checkpoint created: {commit_hash} - {message}")
-                self.save_checkpoint_time()
+                self.save_checkpoint_time(commit_hash)
                 return True
             else:
                 print(f"⚠️ Checkpoint failed: {result.stderr}")
@@ -168,10 +251,13 @@ class AutoCheckpointer:
             print(f"❌ Error creating checkpoint: {e}")
             return False
     
+    def seconds_until_checkpoint(self):
+        """Seconds left before the next checkpoint is due"""
+        return CHECKPOINT_INTERVAL - (time.monotonic() - self.last_checkpoint)
+    
     def should_checkpoint(self):
         """Check if enough time has passed for a checkpoint"""
-        time_since_last = datetime.now() - self.last_checkpoint
-        return time_since_last.total_seconds() >= CHECKPOINT_INTERVAL
+        return self.seconds_until_checkpoint() <= 0
     
     def checkpoint_after_operation(self, operation_type='operation'):
         """Create checkpoint after a major operation"""
@@ -182,17 +268,25 @@ class AutoCheckpointer:
     
     def run_periodic_checkpoints(self):
         """Run checkpoints periodically in the background"""
+        # Sleep in pause() until SIGALRM fires at the next due time; no polling
+        signal.signal(signal.SIGALRM, self.on_checkpoint_alarm)
+        signal.alarm(max(1, int(self.seconds_until_checkpoint())))
         while self.running:
-            if self.should_checkpoint():
-                print(f"\n⏰ Periodic checkpoint (every {CHECKPOINT_INTERVAL//60} minutes)...")
-                self.create_checkpoint_commit()
-            
-            # Check every minute
-            time.sleep(60)
+            signal.pause()
+    
+    def on_checkpoint_alarm(self, signum, frame):
+        """Create the periodic checkpoint and re-arm the alarm"""
+        if self.should_checkpoint():
+            print(f"\n⏰ Periodic checkpoint (every {CHECKPOINT_INTERVAL//60} minutes)...")
+            if not self.create_checkpoint_commit():
+                # Nothing committed; look again a full interval from now
+                self.last_checkpoint = time.monotonic()
+        signal.alarm(max(1, int(self.seconds_until_checkpoint())))
     
     def stop(self):
         """Stop the checkpointer"""
         self.running = False
+        signal.alarm(0)
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
@@ -238,7 +332,7 @@ def main():
             print("⏰ Time for checkpoint...")
             checkpointer.create_checkpoint_commit()
         else:
-            time_until = CHECKPOINT_INTERVAL - (datetime.now() - checkpointer.last_checkpoint).total_seconds()
+            time_until = checkpointer.seconds_until_checkpoint()
             print(f"⏳ Next checkpoint in {int(time_until//60)} minutes")
 
 if __name__ == '__main__':
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Background commands shared by the git hooks.
+spawn() starts a command without waiting for it so several can run at once;
+collect() waits for one and returns its stdout bytes.
+"""
+
+import subprocess
+
+
+def spawn(command, cwd=None):
+    """Start a command in the background; None when it cannot be started"""
+    try:
+        return subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=cwd
+        )
+    except OSError:
+        return None
+
+
+def collect(process):
+    """Wait for a spawned command; its stdout on success, otherwise None"""
+    if process is None:
+        return None
+    stdout, _ = process.communicate()
+    return stdout if process.returncode == 0 else None
@@ -8,6 +8,8 @@ to include the silent failure prevention constraints at the top of their instruc
 
 import os
 import re
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 CRITICAL_CONSTRAINTS = """CRITICAL_CONSTRAINTS:
@@ -19,51 +21,68 @@ CRITICAL_CONSTRAINTS = """CRITICAL_CONSTRAINTS:
 
 """
 
+CONSTRAINTS_BLOCK = CRITICAL_CONSTRAINTS.rstrip().encode('utf-8') + b'\n'
+
+# Start of the first line whose stripped text begins with 'You are '
+YOU_ARE_PATTERN = re.compile(rb'^[^\S\n]*You are ', re.MULTILINE)
+
 def find_agent_files():
     """Find all agent markdown files."""
-    agents_dir = Path.home() / '.claude/agents'
-    return list(agents_dir.rglob('*.md'))
+    # scandir reuses each entry's d_type, so no extra stat or Path per entry
+    stack = [str(Path.home() / '.claude/agents')]
+    agent_files = []
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.md'):
+                    agent_files.append(entry.path)
+    return agent_files
 
-def has_constraints(content):
+def has_constraints(file_path):
     """Check if file already has CRITICAL_CONSTRAINTS."""
-    return 'CRITICAL_CONSTRAINTS:' in content
-
-def find_you_are_line(content):
-    """Find the line that starts with 'You are' to insert constraints before it."""
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if line.strip().startswith('You are '):
-            return i
-    return None
+    # Search the mapped pages directly instead of copying the file into memory
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.find(b'CRITICAL_CONSTRAINTS:') != -1
 
 def update_agent_file(file_path):
     """Update a single agent file to include constraints."""
+    name = os.path.basename(file_path)
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        if has_constraints(content):
-            print(f"✅ {file_path.name} - Already has constraints")
+        # Most files are already updated; settle those without reading them
+        if has_constraints(file_path):
+            print(f"✅ {name} - Already has constraints")
             return True
         
-        you_are_line = find_you_are_line(content)
-        if you_are_line is None:
-            print(f"⚠️  {file_path.name} - Could not find 'You are' line")
-            return False
+        # Work on raw bytes: the constraint block is ASCII, so nothing needs decoding
+        with open(file_path, 'rb') as f:
+            content = f.read()
         
-        lines = content.split('\n')
-        lines.insert(you_are_line, CRITICAL_CONSTRAINTS.rstrip())
+        # Insert the constraints before the line that starts with 'You are'
+        match = YOU_ARE_PATTERN.search(content)
+        if match is None:
+            print(f"⚠️  {name} - Could not find 'You are' line")
+            return False
         
-        new_content = '\n'.join(lines)
+        idx = match.start()
+        new_content = content[:idx] + CONSTRAINTS_BLOCK + content[idx:]
         
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with open(file_path, 'wb') as f:
             f.write(new_content)
         
-        print(f"✅ {file_path.name} - Updated with constraints")
+        print(f"✅ {name} - Updated with constraints")
         return True
         
     except Exception as e:
-        print(f"❌ {file_path.name} - Error: {e}")
+        print(f"❌ {name} - Error: {e}")
         return False
 
 def main():
@@ -75,17 +94,13 @@ def main():
     print(f"Found {len(agent_files)} agent files")
     print()
     
-    success_count = 0
-    skip_count = 0
-    error_count = 0
+    # Each file is an independent read/modify/write, so overlap the I/O
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(update_agent_file, sorted(agent_files)))
     
-    for file_path in sorted(agent_files):
-        relative_path = file_path.relative_to(Path.home() / '.claude/agents')
-        
-        if update_agent_file(file_path):
-            success_count += 1
-        else:
-            error_count += 1
+    success_count = results.count(True)
+    error_count = len(results) - success_count
     
     print()
     print("=" * 60)
@@ -5,10 +5,13 @@ Automatically loads BMAD-METHOD resources for BMAD agents
 """
 
 import os
+import re
 import json
 import sys
 from pathlib import Path
 
+BMAD_CORE_PATH = Path.home() / '.claude' / '.bmad-core'
+
 # BMAD agent identifiers
 BMAD_AGENTS = [
     'bmad-analyst', 'bmad-architect', 'bmad-developer', 'bmad-master',
@@ -16,38 +19,27 @@ BMAD_AGENTS = [
     'bmad-qa', 'bmad-scrum-master', 'bmad-ux-expert', 'completion-enforcer'
 ]
 
-def is_bmad_agent_active():
+# BMAD-related keywords
+BMAD_KEYWORDS = ['bmad', 'story', 'epic', 'brownfield', 'gaal', 'dod']
+
+# Agents and keywords matched in a single case-insensitive pass
+BMAD_PATTERN = re.compile('|'.join(map(re.escape, BMAD_AGENTS + BMAD_KEYWORDS)), re.IGNORECASE)
+
+def is_bmad_agent_active(agent_name, task_description):
     """Check if a BMAD agent is being used"""
-    # Check environment variables or context
-    agent_name = os.environ.get('CLAUDE_AGENT_NAME', '')
-    task_description = os.environ.get('CLAUDE_TASK_DESCRIPTION', '')
-    
-    # Check if any BMAD agent is mentioned
-    for agent in BMAD_AGENTS:
-        if agent in agent_name.lower() or agent in task_description.lower():
-            return True
-    
-    # Check for BMAD-related keywords
-    bmad_keywords = ['bmad', 'story', 'epic', 'brownfield', 'gaal', 'dod']
-    combined_context = f"{agent_name} {task_description}".lower()
-    
-    return any(keyword in combined_context for keyword in bmad_keywords)
+    # Check if any BMAD agent or keyword is mentioned
+    return BMAD_PATTERN.search(f"{agent_name} {task_description}") is not None
 
 def inject_bmad_context():
     """Inject BMAD resource paths into the context"""
-    bmad_core_path = Path.home() / '.claude' / '.bmad-core'
-    
-    if not bmad_core_path.exists():
-        return None
-    
     context = {
         'bmad_resources': {
-            'tasks': str(bmad_core_path / 'tasks'),
-            'templates': str(bmad_core_path / 'templates'),
-            'workflows': str(bmad_core_path / 'workflows'),
-            'checklists': str(bmad_core_path / 'checklists'),
-            'data': str(bmad_core_path / 'data'),
-            'docs': str(bmad_core_path / 'docs')
+            'tasks': str(BMAD_CORE_PATH / 'tasks'),
+            'templates': str(BMAD_CORE_PATH / 'templates'),
+            'workflows': str(BMAD_CORE_PATH / 'workflows'),
+            'checklists': str(BMAD_CORE_PATH / 'checklists'),
+            'data': str(BMAD_CORE_PATH / 'data'),
+            'docs': str(BMAD_CORE_PATH / 'docs')
         },
         'bmad_instructions': """
 You have access to comprehensive BMAD-METHOD resources at:
@@ -66,27 +58,38 @@ Follow the workflows for complex multi-phase operations.
 
 def main():
     """Main hook execution"""
+    # Fast path: most hook fires carry no agent or task to match against
+    agent_name = os.environ.get('CLAUDE_AGENT_NAME', '')
+    task_description = os.environ.get('CLAUDE_TASK_DESCRIPTION', '')
+    if not (agent_name or task_description):
+        return
+    
+    # Imported past the fast path so most fires skip loading the logger
+    from hook_logger import append_log
+    
     try:
-        if is_bmad_agent_active():
+        # Without the BMAD core resources there is nothing to inject
+        if not BMAD_CORE_PATH.exists():
+            return
+        
+        if is_bmad_agent_active(agent_name, task_description):
             context = inject_bmad_context()
             if context:
-                # Output context for agent to use
-                print(json.dumps(context, indent=2))
+                # Output context for agent to use (compact; read by the agent, not a person)
+                print(json.dumps(context, separators=(',', ':')))
                 
                 # Log for debugging
                 debug_log = Path.home() / '.claude' / 'logs' / 'bmad-resource-loader.log'
                 debug_log.parent.mkdir(parents=True, exist_ok=True)
                 
-                with open(debug_log, 'a') as f:
-                    f.write(f"BMAD resources loaded at {os.environ.get('CLAUDE_TIMESTAMP', 'unknown')}\n")
+                append_log(debug_log, f"BMAD resources loaded at {os.environ.get('CLAUDE_TIMESTAMP', 'unknown')}\n")
     
     except Exception as e:
         # Silent failure to not disrupt Claude
         error_log = Path.home() / '.claude' / 'logs' / 'bmad-resource-loader-error.log'
         error_log.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(error_log, 'a') as f:
-            f.write(f"Error: {str(e)}\n")
+        append_log(error_log, f"Error: {str(e)}\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -8,17 +8,38 @@ This dramatically reduces context size and improves agent performance.
 
 import os
 import sys
+import re
 import json
+import time
+import socket
+import subprocess
 from pathlib import Path
 
-# Add git-intelligence src to path
-sys.path.append(str(Path.home() / 'claude-automations' / 'git-intelligence' / 'src'))
+GIT_INTELLIGENCE_SRC = Path.home() / 'claude-automations' / 'git-intelligence' / 'src'
+SOCKET_PATH = Path.home() / '.claude' / 'prism.sock'
+DAEMON_SCRIPT = Path(__file__).with_name('prism-daemon.py')
+DAEMON_START_TIMEOUT = 2.0  # Seconds to wait for a freshly started daemon
+DAEMON_REQUEST_TIMEOUT = 5.0  # Seconds a daemon may take to accept and answer a request
 
-try:
-    from context_dna import ContextDNAProfiler
-except ImportError:
-    print("[PRISM] Warning: Context DNA module not found, using standard context loading")
-    sys.exit(0)
+# Agent indicators in priority order; the first agent with any keyword in the task wins
+AGENT_KEYWORDS = [
+    ('frontend-developer', ['frontend', 'react', 'component', 'ui', 'interface']),
+    ('backend-architect', ['backend', 'api', 'database', 'server', 'endpoint']),
+    ('test-writer-fixer', ['test', 'spec', 'coverage', 'jest', 'pytest']),
+    ('ui-designer', ['design', 'ux', 'user experience', 'wireframe']),
+    ('devops-automator', ['deploy', 'ci/cd', 'docker', 'kubernetes']),
+]
+AGENT_RANKS = {f'agent{rank}': rank for rank in range(len(AGENT_KEYWORDS))}
+
+# One named group per agent, so a single scan of the task finds every indicator.
+# The lookahead tries each position, so overlapping keywords are not skipped.
+AGENT_PATTERN = re.compile(
+    '(?=' + '|'.join(
+        f"(?P<agent{rank}>{'|'.join(map(re.escape, keywords))})"
+        for rank, (_, keywords) in enumerate(AGENT_KEYWORDS)
+    ) + ')',
+    re.IGNORECASE
+)
 
 
 def detect_agent_type() -> str:
@@ -30,21 +51,91 @@ def detect_agent_type() -> str:
         return agent_type
     
     # Try to detect from task prompt
-    task = os.environ.get('CLAUDE_USER_PROMPT', '').lower()
+    task = os.environ.get('CLAUDE_USER_PROMPT', '')
     
     # Pattern matching for common agent indicators
-    if any(word in task for word in ['frontend', 'react', 'component', 'ui', 'interface']):
-        return 'frontend-developer'
-    elif any(word in task for word in ['backend', 'api', 'database', 'server', 'endpoint']):
-        return 'backend-architect'
-    elif any(word in task for word in ['test', 'spec', 'coverage', 'jest', 'pytest']):
-        return 'test-writer-fixer'
-    elif any(word in task for word in ['design', 'ux', 'user experience', 'wireframe']):
-        return 'ui-designer'
-    elif any(word in task for word in ['deploy', 'ci/cd', 'docker', 'kubernetes']):
-        return 'devops-automator'
-    else:
-        return 'general'
+    best = len(AGENT_KEYWORDS)
+    for match in AGENT_PATTERN.finditer(task):
+        best = min(best, AGENT_RANKS[match.lastgroup])
+        if best == 0:
+            break
+    
+    if best < len(AGENT_KEYWORDS):
+        return AGENT_KEYWORDS[best][0]
+    return 'general'
+
+
+def request_context(agent_type: str, task: str) -> dict:
+    """Ask the warm PRISM daemon for a context package"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(DAEMON_REQUEST_TIMEOUT)
+        sock.connect(str(SOCKET_PATH))
+        sock.sendall(json.dumps({'agent': agent_type, 'task': task}).encode() + b'\n')
+        response = json.loads(sock.makefile('rb').readline())
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    return response
+
+
+def start_daemon() -> bool:
+    """Start the PRISM daemon in the background"""
+    if not DAEMON_SCRIPT.exists():
+        return False
+    subprocess.Popen(
+        [sys.executable, str(DAEMON_SCRIPT)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    return True
+
+
+def get_context_local(agent_type: str, task: str) -> dict:
+    """Build the context package in-process when the daemon is unavailable"""
+    # PRISM is only imported here; the daemon path never loads it in the hook
+    sys.path.append(str(GIT_INTELLIGENCE_SRC))
+    try:
+        from context_dna import ContextDNAProfiler
+    except ImportError:
+        print("[PRISM] Warning: Context DNA module not found, using standard context loading")
+        sys.exit(0)
+
+    profiler = ContextDNAProfiler()
+    context_package = profiler.get_optimal_context(agent_type, task)
+    max_context_kb = profiler.profiles[agent_type].max_context_kb
+
+    # Save usage statistics for learning
+    profiler.save_profiles()
+
+    return {'context_package': context_package, 'max_context_kb': max_context_kb}
+
+
+def get_context(agent_type: str, task: str) -> dict:
+    """Get the context package from the daemon, starting it if needed
+
+    A daemon that times out, replies with an error or closes without a reply
+    is left alone and the package is built locally instead.
+    """
+    try:
+        return request_context(agent_type, task)
+    except (ConnectionRefusedError, FileNotFoundError):
+        pass
+    except (OSError, ValueError, RuntimeError):
+        return get_context_local(agent_type, task)
+
+    if start_daemon():
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                return request_context(agent_type, task)
+            except (ConnectionRefusedError, FileNotFoundError):
+                continue
+            except (OSError, ValueError, RuntimeError):
+                break
+
+    return get_context_local(agent_type, task)
 
 
 def load_optimal_context():
@@ -61,40 +152,34 @@ def load_optimal_context():
         print("[PRISM] No task detected, skipping context optimization")
         return
     
-    # Initialize profiler
-    profiler = ContextDNAProfiler()
-    
-    # Get optimal context
+    # Get optimal context from the warm profiler
     print(f"[PRISM] Loading optimal context for {agent_type}")
-    context_package = profiler.get_optimal_context(agent_type, task)
+    response = get_context(agent_type, task)
+    context_package = response['context_package']
+    max_context_kb = response['max_context_kb']
     
     # Create manifest directory
     manifest_dir = Path.home() / '.claude' / 'manifests'
     manifest_dir.mkdir(parents=True, exist_ok=True)
     
-    # Write optimal context to manifest location
+    # Write optimal context to manifest location in a single file. Every
+    # manifest in the package was read from <manifest_dir>/<name>.json, so
+    # those files are already in place and must not be overwritten with the
+    # compressed copies.
     optimal_context_file = manifest_dir / 'OPTIMAL_CONTEXT.json'
     optimal_context_file.write_text(json.dumps(context_package, indent=2))
     
-    # Write individual manifests for backward compatibility
-    for manifest_name, manifest_data in context_package.get('context', {}).items():
-        manifest_file = manifest_dir / f'{manifest_name}.json'
-        manifest_file.write_text(json.dumps(manifest_data, indent=2))
-    
     # Print summary
     print(f"[PRISM] Agent Type: {agent_type}")
     print(f"[PRISM] Manifests Loaded: {', '.join(context_package['manifests_loaded'])}")
     print(f"[PRISM] Context Size: {context_package['context_size_kb']:.2f} KB")
-    print(f"[PRISM] Max Allowed: {profiler.profiles[agent_type].max_context_kb} KB")
+    print(f"[PRISM] Max Allowed: {max_context_kb} KB")
     
     # Check if we're under the limit
-    if context_package['context_size_kb'] <= profiler.profiles[agent_type].max_context_kb:
+    if context_package['context_size_kb'] <= max_context_kb:
         print(f"[PRISM] ✅ Context optimized successfully!")
     else:
         print(f"[PRISM] ⚠️ Context compressed to fit size limit")
-    
-    # Save usage statistics for learning
-    profiler.save_profiles()
 
 
 def main():
@@ -5,6 +5,28 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+def count_lines(path):
+    """Count lines in a log file (0 when it does not exist)."""
+    try:
+        with open(path, 'rb') as f:
+            return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+    except OSError:
+        return 0
+
+def migrate_legacy_sessions(legacy_file, session_file):
+    """Convert the old dict-style sessions.json into append-only JSONL once."""
+    if not legacy_file.exists() or session_file.exists():
+        return
+    
+    with open(legacy_file) as f:
+        sessions = json.load(f)
+    
+    with open(session_file, 'w') as f:
+        for record in sessions.values():
+            f.write(json.dumps(record) + "\n")
+    
+    legacy_file.unlink()
+
 def update_project_intelligence():
     """Gather and update project intelligence after each session."""
     
@@ -12,22 +34,19 @@ def update_project_intelligence():
     analytics_dir = claude_dir / "analytics"
     analytics_dir.mkdir(exist_ok=True)
     
-    # Track session metrics
-    session_file = analytics_dir / "sessions.json"
-    sessions = {}
-    if session_file.exists():
-        with open(session_file) as f:
-            sessions = json.load(f)
+    # Track session metrics, one JSON record per line
+    session_file = analytics_dir / "sessions.jsonl"
+    migrate_legacy_sessions(analytics_dir / "sessions.json", session_file)
     
     session_id = datetime.now().isoformat()
-    sessions[session_id] = {
+    record = {
         "timestamp": session_id,
-        "files_modified": len(list(claude_dir.glob("logs/changes.log"))),
-        "commands_run": len(list(claude_dir.glob("logs/command-history.log"))),
+        "files_modified": count_lines(claude_dir / "logs" / "changes.log"),
+        "commands_run": count_lines(claude_dir / "logs" / "command-history.log"),
     }
     
-    with open(session_file, 'w') as f:
-        json.dump(sessions, f, indent=2)
+    with open(session_file, 'a') as f:
+        f.write(json.dumps(record) + "\n")
     
     print(f"[Intelligence] Session {session_id} recorded")
 
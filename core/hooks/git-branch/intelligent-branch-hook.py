@@ -9,14 +9,69 @@ import json
 import os
 import sys
 import re
+import random
+import time
+import hashlib
+import functools
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 
+# The shared status parser lives in the hooks directory above this one
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from git_snapshot import GIT_STATUS_COMMAND, GitSnapshot, parse_git_status
+
+# Snapshot cache: served as-is while fresh, served and refreshed in the background while stale
+SNAPSHOT_FRESH_SECONDS = 2
+SNAPSHOT_STALE_SECONDS = 30
+
+# One anchored match classifies a path into every category it belongs to: each
+# optional lookahead sets its group when the path contains that category's marker
+WORK_TYPE_PATTERN = re.compile(
+    r'(?=(?P<test>.*?(?i:test|spec)))?'
+    r'(?=(?P<docs>.*\.md\Z|.*?(?i:doc)))?'
+    r'(?=(?P<config>.*?(?:\.json|\.yml|\.yaml|\.toml|config)))?'
+    r'(?=(?P<source>.*?(?:\.py|\.js|\.ts|\.go|\.rs|\.java|\.cpp|\.c)))?',
+    re.ASCII | re.DOTALL
+)
+WORK_TYPE_GROUPS = ('test', 'docs', 'config', 'source')
+
+# Larger changesets are classified from a sample of this many files
+WORK_TYPE_SAMPLE_SIZE = 256
+
+# Branch name cleanup
+_NON_ALNUM_SPACE = re.compile(r'[^a-zA-Z0-9\s]')
+_WS = re.compile(r'\s+')
+_NON_ALNUM = re.compile(r'[^a-zA-Z0-9]')
+
+MCP_CONFIG_FILE = Path.home() / '.claude-code' / 'mcp' / 'global.json'
+
+# Parsed MCP availability keyed on the config's (mtime_ns, size)
+_mcp_cache = {'key': None, 'available': False}
+
+def read_git_snapshot():
+    """Run git status once and parse branch, ahead/behind and file records"""
+    result = subprocess.run(GIT_STATUS_COMMAND, capture_output=True, check=True)
+    return parse_git_status(result.stdout)
+
+@functools.lru_cache(maxsize=8)
+def _find_git_root(cwd):
+    """Repository root for a working directory, resolved once per process"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--show-toplevel'],
+            capture_output=True, check=True, cwd=cwd
+        )
+        return Path(os.fsdecode(result.stdout.rstrip(b'\n')))
+    except subprocess.CalledProcessError:
+        return Path(cwd)
+
 class IntelligentBranchHook:
     def __init__(self):
         self.project_root = self.find_git_root()
         self.claude_dir = Path.home() / '.claude'
         self.debug_mode = os.getenv('GIT_BRANCH_DEBUG', 'false').lower() == 'true'
+        self._snapshot = None
         
     def log(self, message):
         """Log debug messages if debug mode is enabled"""
@@ -25,73 +80,152 @@ class IntelligentBranchHook:
     
     def find_git_root(self):
         """Find the git repository root"""
-        try:
-            result = subprocess.run(
-                ['git', 'rev-parse', '--show-toplevel'],
-                capture_output=True, text=True, check=True
-            )
-            return Path(result.stdout.strip())
-        except subprocess.CalledProcessError:
-            return Path.cwd()
+        return _find_git_root(os.getcwd())
     
     def is_mcp_server_available(self):
         """Check if the MCP server is available"""
         try:
             # Simple check - try to find MCP server process or config
-            mcp_config = Path.home() / '.claude-code' / 'mcp' / 'global.json'
-            if mcp_config.exists():
-                with open(mcp_config) as f:
-                    config = json.load(f)
-                    return 'git-branch-intelligence' in config.get('mcpServers', {})
+            st = MCP_CONFIG_FILE.stat()
+        except OSError:
             return False
+        
+        # Only re-read the config when it has changed since the last check
+        key = (st.st_mtime_ns, st.st_size)
+        if _mcp_cache['key'] == key:
+            return _mcp_cache['available']
+        
+        try:
+            with open(MCP_CONFIG_FILE) as f:
+                config = json.load(f)
+            available = 'git-branch-intelligence' in config.get('mcpServers', {})
         except Exception:
             return False
+        
+        _mcp_cache['key'] = key
+        _mcp_cache['available'] = available
+        return available
+    
+    def get_snapshot(self, fresh=False):
+        """Read the repository state once and share it between checks
+
+        The snapshot cache is keyed on the index and HEAD, which a worktree edit
+        does not touch, so anything that stashes or checks out passes fresh=True
+        to read git status directly.
+        """
+        if fresh:
+            self._snapshot = self.refresh_snapshot_cache()
+        if self._snapshot is None:
+            self._snapshot = self.load_cached_snapshot()
+        if self._snapshot is None:
+            self._snapshot = self.refresh_snapshot_cache()
+        return self._snapshot
+    
+    @property
+    def snapshot_cache_file(self):
+        root_hash = hashlib.sha1(str(self.project_root).encode()).hexdigest()[:16]
+        return self.claude_dir / f'git-snapshot-{root_hash}.json'
+    
+    def snapshot_key(self):
+        """Index mtime plus HEAD; None when the repository layout is not a plain .git dir"""
+        git_dir = self.project_root / '.git'
+        try:
+            index_mtime = os.stat(git_dir / 'index').st_mtime_ns
+            head = (git_dir / 'HEAD').read_text().strip()
+        except OSError:
+            return None
+        return [index_mtime, head]
+    
+    def load_cached_snapshot(self):
+        """Return a recent snapshot for the same index and HEAD, refreshing it if stale"""
+        key = self.snapshot_key()
+        if key is None:
+            return None
+        try:
+            with open(self.snapshot_cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('key') != key:
+            return None
+        
+        age = time.time() - cached.get('time', 0)
+        if age >= SNAPSHOT_STALE_SECONDS:
+            return None
+        if age >= SNAPSHOT_FRESH_SECONDS:
+            self.spawn_snapshot_refresh()
+        return GitSnapshot(**cached['snapshot'])
+    
+    def refresh_snapshot_cache(self):
+        """Run git status and store the result for the next hook fire"""
+        key = self.snapshot_key()
+        snapshot = read_git_snapshot()
+        if key is None:
+            return snapshot
+        
+        # Only a successful read reaches this point, so a failed git call never replaces the cache
+        cache_file = self.snapshot_cache_file
+        tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump({'key': key, 'time': time.time(), 'snapshot': asdict(snapshot)}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.log(f"Could not write snapshot cache: {e}")
+        return snapshot
+    
+    def spawn_snapshot_refresh(self):
+        """Refresh the cache in a detached process; one refresh at a time"""
+        lock_file = self.snapshot_cache_file.with_suffix('.lock')
+        try:
+            if time.time() - lock_file.stat().st_mtime < SNAPSHOT_STALE_SECONDS:
+                return
+            lock_file.unlink()  # Left behind by a refresh that died
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+        except OSError:
+            return  # Another hook fire won the race
+        
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'refresh-snapshot', str(lock_file)],
+            cwd=self.project_root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    
+    def invalidate_snapshot(self):
+        """Forget the cached state after changing branches or the worktree"""
+        self._snapshot = None
+        self.snapshot_cache_file.unlink(missing_ok=True)
     
     def get_current_branch(self):
         """Get current branch name"""
         try:
-            result = subprocess.run(
-                ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                capture_output=True, text=True, check=True
-            )
-            return result.stdout.strip()
+            return self.get_snapshot().branch
         except subprocess.CalledProcessError:
             return None
     
-    def get_git_status(self):
+    def get_git_status(self, fresh=False):
         """Get git status information"""
         try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True, text=True, check=True
-            )
-            
-            lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            
-            status = {
-                'modified': [],
-                'added': [],
-                'deleted': [],
-                'untracked': []
-            }
-            
-            for line in lines:
-                if line:
-                    status_code = line[:2]
-                    filename = line[3:]
-                    
-                    if 'M' in status_code:
-                        status['modified'].append(filename)
-                    elif 'A' in status_code:
-                        status['added'].append(filename)
-                    elif 'D' in status_code:
-                        status['deleted'].append(filename)
-                    elif '??' in status_code:
-                        status['untracked'].append(filename)
-            
-            return status
+            snapshot = self.get_snapshot(fresh)
         except subprocess.CalledProcessError:
             return {}
+        
+        return {
+            'modified': list(snapshot.modified),
+            'added': list(snapshot.added),
+            'deleted': list(snapshot.deleted),
+            'untracked': list(snapshot.untracked)
+        }
     
     def detect_work_type(self):
         """Detect the type of work being done based on file changes"""
@@ -105,11 +239,23 @@ class IntelligentBranchHook:
         if not all_files:
             return {'type': 'unknown', 'confidence': 0}
         
-        # Analyze file patterns
-        test_files = len([f for f in all_files if 'test' in f.lower() or 'spec' in f.lower()])
-        doc_files = len([f for f in all_files if f.endswith('.md') or 'doc' in f.lower()])
-        config_files = len([f for f in all_files if any(ext in f for ext in ['.json', '.yml', '.yaml', '.toml', 'config'])])
-        source_files = len([f for f in all_files if any(ext in f for ext in ['.py', '.js', '.ts', '.go', '.rs', '.java', '.cpp', '.c'])])
+        # Only the category ratios matter, so a large changeset (initial
+        # commit, vendored update) is estimated from a fixed-size sample.
+        # Seeding from the sorted file list gives the same answer on every
+        # run for the same changes; string seeds are stable across processes.
+        if len(all_files) > WORK_TYPE_SAMPLE_SIZE:
+            rng = random.Random('\0'.join(sorted(all_files)))
+            all_files = rng.sample(all_files, WORK_TYPE_SAMPLE_SIZE)
+        
+        # Analyze file patterns (a file may count towards several categories)
+        counts = [0, 0, 0, 0]
+        match = WORK_TYPE_PATTERN.match
+        for f in all_files:
+            groups = match(f).group(*WORK_TYPE_GROUPS)
+            for i, hit in enumerate(groups):
+                if hit is not None:
+                    counts[i] += 1
+        test_files, doc_files, config_files, source_files = counts
         
         total_files = len(all_files)
         
@@ -133,8 +279,8 @@ class IntelligentBranchHook:
         
         if context:
             # Clean up the context for branch naming
-            clean_context = re.sub(r'[^a-zA-Z0-9\s]', '', context)
-            clean_context = re.sub(r'\s+', '-', clean_context.strip())
+            clean_context = _NON_ALNUM_SPACE.sub('', context)
+            clean_context = _WS.sub('-', clean_context.strip())
             clean_context = clean_context.lower()[:30]  # Limit length
             
             return f"{work_type}/{clean_context}"
@@ -147,7 +293,7 @@ class IntelligentBranchHook:
                 # Try to infer context from modified files
                 first_file = modified_files[0]
                 file_base = Path(first_file).stem
-                clean_name = re.sub(r'[^a-zA-Z0-9]', '-', file_base)
+                clean_name = _NON_ALNUM.sub('-', file_base)
                 return f"{work_type}/{clean_name}"
             else:
                 # Fallback to timestamp
@@ -173,28 +319,31 @@ class IntelligentBranchHook:
         except subprocess.CalledProcessError as e:
             self.log(f"Failed to create branch {branch_name}: {e}")
             return False
+        finally:
+            # Either checkout may have moved HEAD
+            self.invalidate_snapshot()
+    
+    def get_branch_refs(self):
+        """Short names of all local and remote-tracking branches, for exact lookups"""
+        result = subprocess.run(
+            ['git', 'for-each-ref', '--format=%(refname:short)', 'refs/heads', 'refs/remotes'],
+            capture_output=True, check=True
+        )
+        return set(result.stdout.split())
     
     def get_default_base_branch(self):
         """Get the default base branch (main, master, etc.)"""
         try:
             # Get all branches
-            result = subprocess.run(
-                ['git', 'branch', '-a'],
-                capture_output=True, text=True, check=True
-            )
+            refs = self.get_branch_refs()
             
-            branches = result.stdout
+            # Check for common main branches (exact names, so 'feature/maintenance' is not 'main')
+            for name in ('main', 'master', 'develop'):
+                if name.encode() in refs or f'origin/{name}'.encode() in refs:
+                    return name
             
-            # Check for common main branches
-            if 'main' in branches:
-                return 'main'
-            elif 'master' in branches:
-                return 'master'
-            elif 'develop' in branches:
-                return 'develop'
-            else:
-                # Return current branch as fallback
-                return self.get_current_branch()
+            # Return current branch as fallback
+            return self.get_current_branch()
                 
         except subprocess.CalledProcessError:
             return 'main'  # Safe fallback
@@ -203,26 +352,25 @@ class IntelligentBranchHook:
         """Smart branch switching with safety checks"""
         try:
             # Check if branch exists
-            result = subprocess.run(
-                ['git', 'branch', '-a'],
-                capture_output=True, text=True
-            )
-            
-            branch_exists = target_branch in result.stdout
+            refs = self.get_branch_refs()
+            target = os.fsencode(target_branch)
+            branch_exists = target in refs or b'origin/' + target in refs
             
-            # Check for uncommitted changes
-            status = self.get_git_status()
+            # Check for uncommitted changes; the stash decision needs the live tree
+            status = self.get_git_status(fresh=True)
             has_changes = any(len(files) > 0 for files in status.values())
             
             if has_changes:
                 # Stash changes before switching
                 subprocess.run(['git', 'stash', 'push', '-m', f'Auto-stash before switching to {target_branch}'], 
                              check=True, capture_output=True)
+                self.invalidate_snapshot()
                 self.log("Stashed changes before branch switch")
             
             if branch_exists:
                 # Switch to existing branch
                 subprocess.run(['git', 'checkout', target_branch], check=True, capture_output=True)
+                self.invalidate_snapshot()
                 self.log(f"Switched to existing branch: {target_branch}")
                 return True
             elif create_if_missing:
@@ -276,6 +424,12 @@ class IntelligentBranchHook:
         
         suggestions = self.suggest_branch_action()
         
+        # Suggestions may come from the cached snapshot; confirm against the
+        # live tree before checking anything out
+        if any(s['priority'] == 'high' and s['action'] == 'create_branch' for s in suggestions):
+            self.get_snapshot(fresh=True)
+            suggestions = self.suggest_branch_action()
+        
         # Auto-create branch if high priority suggestion
         for suggestion in suggestions:
             if suggestion['priority'] == 'high' and suggestion['action'] == 'create_branch':
@@ -301,7 +455,17 @@ def main():
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
-        if command == 'suggest':
+        if command == 'refresh-snapshot':
+            # Background refresh started by spawn_snapshot_refresh
+            try:
+                hook.refresh_snapshot_cache()
+            except subprocess.CalledProcessError:
+                pass
+            finally:
+                if len(sys.argv) > 2:
+                    Path(sys.argv[2]).unlink(missing_ok=True)
+        
+        elif command == 'suggest':
             suggestions = hook.suggest_branch_action()
             print(json.dumps(suggestions, indent=2))
         
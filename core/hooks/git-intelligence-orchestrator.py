@@ -3,24 +3,85 @@
 Git Intelligence Orchestrator Hook
 Master coordinator for all Smart Commit Genie features
 Runs appropriate automation based on git state and Claude context
+
+On first run in a repository it enables git's untracked cache (and the
+builtin fsmonitor on macOS/Windows) so the per-hook git status stays fast.
+Set CLAUDE_DISABLE_FSMONITOR=true to leave the repository config untouched.
+
+A run is skipped when another run in the same repository finished within
+the last few seconds and neither .git/index nor HEAD has changed since.
+Set CLAUDE_FORCE_GIT_INTELLIGENCE=true to always run.
 """
 
 import os
 import sys
 import json
+import time
+import atexit
+import hashlib
 import subprocess
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
-# Add git-intelligence to path
+from background_command import spawn, collect
+from git_snapshot import GIT_STATUS_COMMAND, parse_git_status
+
+# Add git-intelligence to path; the managers are imported by execute_actions
+# only when an action fires, so a hook fire with nothing to do skips them
 sys.path.insert(0, '/Users/umasankrudhya/claude-automations/git-intelligence/src')
 
-# Import all managers
-from auto_branching import AutoBranchManager
-from auto_pr import AutoPRManager
-from pr_reviewer import PRAutoReviewer
-from smart_merge import SmartMergeManager
-from failure_prevention import FailurePreventionSystem
+LEARNED_FILE = Path.home() / ".claude" / "smart-genie-learned.json"
+
+# Learned patterns, loaded on first use and written back once at exit
+_LEARNED = None
+_LEARNED_DIRTY = False
+
+
+def _load_learned():
+    """Learned patterns for this process, read from disk on first use"""
+    global _LEARNED
+    if _LEARNED is None:
+        try:
+            with open(LEARNED_FILE, 'r') as f:
+                _LEARNED = json.load(f)
+        except FileNotFoundError:
+            _LEARNED = {"commit_patterns": {}, "branch_patterns": {}}
+    return _LEARNED
+
+
+def _record_patterns(kind, counts):
+    """Add pattern counts to the in-memory learned patterns"""
+    global _LEARNED_DIRTY
+    patterns = _load_learned().setdefault(kind, {})
+    for pattern, count in counts.items():
+        patterns[pattern] = patterns.get(pattern, 0) + count
+    _LEARNED_DIRTY = True
+
+
+@atexit.register
+def _flush_learned():
+    """Write learned patterns back if this process updated them"""
+    global _LEARNED_DIRTY
+    if _LEARNED_DIRTY:
+        _LEARNED_DIRTY = False
+        try:
+            with open(LEARNED_FILE, 'w') as f:
+                json.dump(_LEARNED, f, indent=2)
+        except OSError:
+            pass
+
+
+# One marker per repository whose fast-status config has been checked
+FAST_STATUS_MARKERS = Path.home() / ".claude" / "fsmonitor-configured"
+
+
+def read_git_snapshot():
+    """Run git status once and parse branch, ahead/behind and file records"""
+    result = subprocess.run(GIT_STATUS_COMMAND, capture_output=True)
+    if result.returncode != 0:
+        return None
+    return parse_git_status(result.stdout)
 
 
 class GitIntelligenceOrchestrator:
@@ -29,6 +90,16 @@ class GitIntelligenceOrchestrator:
     def __init__(self):
         self.config_file = Path.home() / ".claude" / "smart-genie-orchestrator.json"
         self.load_config()
+        self.enable_fast_status()
+        self.snapshot = None
+        self.pr_process = None
+        self._pr_exists = None
+        
+        # Independent of the git state, so read the history while status runs
+        self.history_process = None
+        if self.config["intelligence"]["learn_patterns"]:
+            self.history_process = spawn(["git", "log", "--pretty=format:%s", "-20"])
+        
         self.state = self.analyze_git_state()
         
     def load_config(self):
@@ -66,6 +137,38 @@ class GitIntelligenceOrchestrator:
         with open(self.config_file, 'w') as f:
             json.dump(self.config, f, indent=2)
             
+    def enable_fast_status(self):
+        """Turn on fsmonitor and the untracked cache once per repository"""
+        if os.environ.get("CLAUDE_DISABLE_FSMONITOR") == "true":
+            return
+        if not os.path.isdir(".git"):
+            return
+        
+        repo_key = hashlib.sha1(os.getcwd().encode()).hexdigest()[:16]
+        marker = FAST_STATUS_MARKERS / repo_key
+        if marker.exists():
+            return
+        
+        settings = {"core.untrackedCache": "true"}
+        # The builtin fsmonitor daemon only exists on macOS and Windows
+        if sys.platform in ("darwin", "win32"):
+            settings["core.fsmonitor"] = "true"
+        
+        try:
+            for key, value in settings.items():
+                # Never override a value the user configured
+                current = subprocess.run(
+                    ["git", "config", "--get", key],
+                    capture_output=True
+                )
+                if current.returncode == 1:
+                    subprocess.run(["git", "config", key, value], capture_output=True, check=True)
+            
+            FAST_STATUS_MARKERS.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except (OSError, subprocess.CalledProcessError):
+            pass
+            
     def analyze_git_state(self):
         """Analyze current git repository state"""
         state = {
@@ -80,43 +183,35 @@ class GitIntelligenceOrchestrator:
         }
         
         try:
-            # Check for changes
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                state["has_changes"] = True
+            # Changes, staged changes and branch from one git status call
+            self.snapshot = read_git_snapshot()
+            if self.snapshot is not None:
+                state["has_changes"] = self.snapshot.has_changes
+                state["has_staged"] = bool(self.snapshot.staged)
                 
-                # Check for staged changes
-                lines = result.stdout.strip().split('\n')
-                state["has_staged"] = any(line[0] in 'MADRC' for line in lines if line)
-            
-            # Get branch info
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                branch = result.stdout.strip()
+                branch = self.snapshot.branch
                 state["branch_info"]["name"] = branch
                 state["on_feature_branch"] = branch not in ["main", "master", "develop"]
             
             # Check for unpushed commits
             if state["on_feature_branch"]:
-                result = subprocess.run(
-                    ["git", "log", "origin/main..HEAD", "--oneline"],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0 and result.stdout.strip():
+                log_process = spawn(["git", "log", "origin/main..HEAD", "--oneline"])
+                
+                # Review always looks the PR up, and the lookup only needs the branch
+                # name, so start it alongside the log; suggest_pr alone depends on the
+                # commit count and leaves it to check_pr_exists
+                if self.config["enabled"] and self.config["features"].get("auto_review", False):
+                    self.pr_process = spawn(
+                        ["gh", "pr", "list", "--head", branch, "--json", "number"]
+                    )
+                
+                stdout = collect(log_process)
+                if stdout and stdout.strip():
                     state["has_commits"] = True
-                    state["branch_info"]["commits"] = len(result.stdout.strip().split('\n'))
+                    state["branch_info"]["commits"] = stdout.strip().count(b'\n') + 1
             
             # Check for merge in progress
-            state["merge_in_progress"] = (Path(".git") / "MERGE_HEAD").exists()
+            state["merge_in_progress"] = os.path.lexists(".git/MERGE_HEAD")
             
             # Get Claude context
             state["context"]["task"] = os.environ.get("CLAUDE_CURRENT_TASK", "")
@@ -134,48 +229,61 @@ class GitIntelligenceOrchestrator:
         if not self.config["enabled"]:
             return actions
         
-        features = self.config["features"]
+        state = self.state
+        f_branch, f_val, f_pr, f_rev, f_merge = (
+            self.config["features"].get(k, False)
+            for k in ("auto_branch", "auto_validate", "auto_pr", "auto_review", "auto_merge")
+        )
+        has_changes = state["has_changes"]
+        on_feature_branch = state["on_feature_branch"]
+        
+        # Steady state: a clean tree with no merge and no PR work to check
+        if not has_changes and not state["merge_in_progress"]:
+            if not (on_feature_branch and (f_pr or f_rev)):
+                return actions
         
         # Branch creation logic
-        if features["auto_branch"]:
-            if not self.state["on_feature_branch"] and self.state["has_changes"]:
+        if f_branch:
+            if not on_feature_branch and has_changes:
                 if len(self.get_changed_files()) >= 2:
                     actions.append("create_branch")
         
         # Validation logic
-        if features["auto_validate"]:
-            if self.state["has_staged"]:
+        if f_val:
+            if state["has_staged"]:
                 actions.append("validate")
         
         # PR creation logic
-        if features["auto_pr"]:
-            if self.state["on_feature_branch"] and self.state["has_commits"]:
-                if self.state["branch_info"].get("commits", 0) >= 3:
+        if f_pr:
+            if on_feature_branch and state["has_commits"]:
+                if state["branch_info"].get("commits", 0) >= 3:
                     if not self.check_pr_exists():
                         actions.append("suggest_pr")
         
         # Review logic
-        if features["auto_review"]:
+        if f_rev:
             if self.check_pr_exists():
                 actions.append("review_pr")
         
         # Merge logic
-        if features["auto_merge"]:
-            if self.state["merge_in_progress"]:
+        if f_merge:
+            if state["merge_in_progress"]:
                 actions.append("check_merge_safety")
         
         return actions
         
     def get_changed_files(self):
         """Get list of changed files"""
+        if self.snapshot is not None:
+            return self.snapshot.changed_files
+        
         try:
             result = subprocess.run(
-                ["git", "diff", "--name-only"],
-                capture_output=True,
-                text=True
+                ["git", "diff", "--name-only", "-z"],
+                capture_output=True
             )
             if result.returncode == 0:
-                return [f for f in result.stdout.strip().split('\n') if f]
+                return [os.fsdecode(f) for f in result.stdout.split(b'\0') if f]
         except:
             pass
         return []
@@ -185,21 +293,26 @@ class GitIntelligenceOrchestrator:
         if not self.state["on_feature_branch"]:
             return False
             
+        if self._pr_exists is not None:
+            return self._pr_exists
+        
+        self._pr_exists = False
         try:
-            branch = self.state["branch_info"]["name"]
-            result = subprocess.run(
-                ["gh", "pr", "list", "--head", branch, "--json", "number"],
-                capture_output=True,
-                text=True
-            )
+            # Already started by analyze_git_state when auto_review is on
+            process = self.pr_process
+            if process is None:
+                branch = self.state["branch_info"]["name"]
+                process = spawn(["gh", "pr", "list", "--head", branch, "--json", "number"])
+            self.pr_process = None
             
-            if result.returncode == 0:
-                prs = json.loads(result.stdout)
-                return len(prs) > 0
+            stdout = collect(process)
+            if stdout is not None:
+                prs = json.loads(stdout)
+                self._pr_exists = len(prs) > 0
         except:
             pass
             
-        return False
+        return self._pr_exists
         
     def execute_actions(self, actions):
         """Execute determined actions"""
@@ -208,6 +321,7 @@ class GitIntelligenceOrchestrator:
         for action in actions:
             try:
                 if action == "create_branch":
+                    from auto_branching import AutoBranchManager
                     manager = AutoBranchManager()
                     context = {
                         "changed_files": self.get_changed_files(),
@@ -218,6 +332,7 @@ class GitIntelligenceOrchestrator:
                         results.append(f"Created branch: {result}")
                         
                 elif action == "validate":
+                    from failure_prevention import FailurePreventionSystem
                     prevention = FailurePreventionSystem()
                     result = prevention.pre_commit_checks()
                     if not result["passed"]:
@@ -227,12 +342,14 @@ class GitIntelligenceOrchestrator:
                     results.append("Branch ready for PR - use /pr to create")
                     
                 elif action == "review_pr":
+                    from pr_reviewer import PRAutoReviewer
                     reviewer = PRAutoReviewer()
                     result = reviewer.review_pr()
                     if result["reviewed"]:
                         results.append("PR reviewed automatically")
                         
                 elif action == "check_merge_safety":
+                    from smart_merge import SmartMergeManager
                     manager = SmartMergeManager()
                     backup_id = manager.create_backup()
                     if backup_id:
@@ -250,41 +367,22 @@ class GitIntelligenceOrchestrator:
             return
         
         try:
-            # Analyze commit patterns
-            result = subprocess.run(
-                ["git", "log", "--pretty=format:%s", "-20"],
-                capture_output=True,
-                text=True
-            )
+            # Analyze commit patterns (history read started in __init__)
+            process = self.history_process or spawn(["git", "log", "--pretty=format:%s", "-20"])
+            self.history_process = None
+            stdout = collect(process)
             
-            if result.returncode == 0:
-                commits = result.stdout.strip().split('\n')
+            if stdout is not None:
+                commits = stdout.decode("utf-8", "replace").strip().split('\n')
                 
-                # Learn commit message patterns
-                patterns = {}
-                for commit in commits:
-                    # Extract pattern (e.g., "feat:", "fix:", etc.)
-                    if ':' in commit:
-                        prefix = commit.split(':')[0].lower()
-                        patterns[prefix] = patterns.get(prefix, 0) + 1
+                # Learn commit message patterns (e.g., "feat:", "fix:", etc.)
+                patterns = Counter(
+                    commit.split(':', 1)[0].lower() for commit in commits if ':' in commit
+                )
                 
-                # Save learned patterns
+                # Update learned patterns in memory; _flush_learned saves them on exit
                 if patterns:
-                    learned_file = Path.home() / ".claude" / "smart-genie-learned.json"
-                    
-                    if learned_file.exists():
-                        with open(learned_file, 'r') as f:
-                            learned = json.load(f)
-                    else:
-                        learned = {"commit_patterns": {}, "branch_patterns": {}}
-                    
-                    # Update patterns
-                    for pattern, count in patterns.items():
-                        learned["commit_patterns"][pattern] = \
-                            learned["commit_patterns"].get(pattern, 0) + count
-                    
-                    with open(learned_file, 'w') as f:
-                        json.dump(learned, f, indent=2)
+                    _record_patterns("commit_patterns", patterns)
                         
         except:
             pass
@@ -354,23 +452,68 @@ class GitIntelligenceOrchestrator:
             log_file = Path.home() / ".claude" / "smart-genie-orchestrator.log"
             log_file.parent.mkdir(exist_ok=True)
             
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + "\n")
+            # A single O_APPEND write keeps concurrent hook entries whole
+            from hook_logger import append_log
+            append_log(log_file, json.dumps(log_entry) + "\n")
                 
         except Exception as e:
             if os.environ.get("CLAUDE_DEBUG") == "true":
                 print(f"Orchestrator error: {e}")
 
 
+LAST_RUN_FILE = Path.home() / ".claude" / "smart-genie-last.mtime"
+SKIP_WINDOW_SECONDS = 10
+
+
+def read_state_key():
+    """Repository, .git/index mtime and HEAD, or None outside a plain .git checkout"""
+    try:
+        index_mtime = os.stat(".git/index").st_mtime_ns
+        with open(".git/HEAD", "rb") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    return json.dumps([os.getcwd(), index_mtime, os.fsdecode(head)])
+
+
+def state_unchanged(key):
+    """Whether the last run saw the same state within the skip window"""
+    try:
+        if time.time() - os.stat(LAST_RUN_FILE).st_mtime > SKIP_WINDOW_SECONDS:
+            return False
+        with open(LAST_RUN_FILE, "r") as f:
+            return f.read() == key
+    except OSError:
+        return False
+
+
+def remember_state(key):
+    """Record the state this run acted on"""
+    try:
+        with open(LAST_RUN_FILE, "w") as f:
+            f.write(key)
+    except OSError:
+        pass
+
+
 def main():
     """Main entry point"""
     # Check if orchestrator is disabled
     if os.environ.get("CLAUDE_DISABLE_GIT_INTELLIGENCE") == "true":
         return
     
+    # Editor-triggered hooks fire in bursts; skip repeats over an unchanged index and HEAD
+    key = read_state_key()
+    if key is not None and os.environ.get("CLAUDE_FORCE_GIT_INTELLIGENCE") != "true":
+        if state_unchanged(key):
+            return
+    
     # Run orchestrator
     orchestrator = GitIntelligenceOrchestrator()
     orchestrator.run()
+    
+    if key is not None:
+        remember_state(key)
 
 
 if __name__ == "__main__":
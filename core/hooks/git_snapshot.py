@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Git status snapshot shared by the git hooks.
+Parses a single `git status --porcelain=v2 --branch -z` call into branch,
+ahead/behind and file lists.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+GIT_STATUS_COMMAND = [
+    "git", "--no-optional-locks", "status", "--porcelain=v2", "--branch",
+    "--untracked-files=all", "--no-ahead-behind", "-z"
+]
+
+# Byte value of "." in a porcelain=v2 XY field, meaning no change on that side
+_UNCHANGED = ord(".")
+
+# Bucket for a tracked path, looked up by its index (X) status, then its worktree (Y) status
+XY_BUCKETS = {"M": "modified", "A": "added", "D": "deleted", "R": "modified", "C": "added"}
+
+
+@dataclass
+class GitSnapshot:
+    """Branch and file status read from a single porcelain=v2 git status call"""
+    branch: Optional[str] = None
+    ahead: Optional[int] = None
+    behind: Optional[int] = None
+    # Tracked paths by side: X (index) and Y (worktree) differ from "."
+    staged: List[str] = field(default_factory=list)
+    unstaged: List[str] = field(default_factory=list)
+    unmerged: List[str] = field(default_factory=list)
+    # Tracked and unmerged paths by kind of change, see XY_BUCKETS
+    modified: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    untracked: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self):
+        return bool(self.staged or self.unstaged or self.unmerged or self.untracked)
+
+    @property
+    def changed_files(self):
+        """Paths `git diff --name-only` would list"""
+        return self.unmerged + self.unstaged
+
+
+def parse_git_status(stdout: bytes) -> GitSnapshot:
+    """Parse porcelain=v2 -z output; only paths and the branch name are decoded"""
+    snapshot = GitSnapshot()
+    buckets = {ord(code): getattr(snapshot, name) for code, name in XY_BUCKETS.items()}
+    records = iter(stdout.split(b"\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == b"1":
+            path = os.fsdecode(record.split(b" ", 8)[8])
+        elif kind == b"2":
+            path = os.fsdecode(record.split(b" ", 9)[9])
+            next(records, None)  # Skip the rename/copy source path
+        elif kind == b"u":
+            path = os.fsdecode(record.split(b" ", 10)[10])
+            snapshot.unmerged.append(path)
+        elif kind == b"?":
+            snapshot.untracked.append(os.fsdecode(record[2:]))
+            continue
+        elif record.startswith(b"# branch.head "):
+            head = os.fsdecode(record[len(b"# branch.head "):])
+            snapshot.branch = "HEAD" if head == "(detached)" else head
+            continue
+        elif record.startswith(b"# branch.ab "):
+            ahead, behind = record[len(b"# branch.ab "):].split(b" ")
+            if ahead[1:].isdigit() and behind[1:].isdigit():
+                snapshot.ahead, snapshot.behind = int(ahead[1:]), int(behind[1:])
+            continue
+        else:
+            continue
+
+        # XY is always the second field of a tracked-file record
+        x, y = record[2], record[3]
+        if kind != b"u":
+            if x != _UNCHANGED:
+                snapshot.staged.append(path)
+            if y != _UNCHANGED:
+                snapshot.unstaged.append(path)
+        bucket = buckets.get(x)
+        if bucket is None:
+            bucket = buckets.get(y)
+        if bucket is not None:
+            bucket.append(path)
+    return snapshot
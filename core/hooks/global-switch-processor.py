@@ -6,35 +6,53 @@ This hook processes text replacement switches like -u, -r, -o, -t, -p from setti
 
 import json
 import os
+import re
 import sys
 from pathlib import Path
 
+# Built-in switch configuration (since textReplacementSwitches isn't valid in settings.json)
+SWITCHES = {
+    "-u": "Think deeply and thoroughly about this problem. Consider multiple perspectives, edge cases, and implications. Take time to analyze all aspects before responding.",
+    "-r": "Research this topic thoroughly using all available resources. Provide comprehensive, well-sourced information with deep analysis.",
+    "-o": "Optimize this solution for maximum performance, efficiency, and adherence to best practices. Consider scalability and maintainability.",
+    "-t": "Think through this step-by-step with careful reasoning and logical analysis. Break down complex problems into manageable parts.",
+    "-p": "Create a detailed, actionable plan with clear steps, milestones, dependencies, and success criteria. Include risk assessment and contingencies.",
+    "--rules": "MANDATORY: Strictly follow all AI development rules in ~/claude-automations/rules.md. Apply ALL rules: Planning & Discovery (research first), Code Quality & Security (NIST compliance), Workflow & Process (review before deploy), Testing & Validation (test-driven development), Documentation & Compliance (EU AI Act), Dependency & Architecture (no duplicates), and AI-Specific Development (responsible AI). These rules are NON-NEGOTIABLE."
+}
+
+# All switches in one alternation, longest first so "--rules" wins over "-r".
+# A switch must stand alone: "-u" inside "--user" or "re-use" is left as typed.
+SWITCH_PATTERN = re.compile(
+    r'(?<![\w-])(?:' + '|'.join(map(re.escape, sorted(SWITCHES, key=len, reverse=True))) + r')(?![\w-])'
+)
+
 def process_global_switches():
     """Process global text replacement switches with built-in configuration."""
     
-    # Built-in switch configuration (since textReplacementSwitches isn't valid in settings.json)
-    switches = {
-        "-u": "Think deeply and thoroughly about this problem. Consider multiple perspectives, edge cases, and implications. Take time to analyze all aspects before responding.",
-        "-r": "Research this topic thoroughly using all available resources. Provide comprehensive, well-sourced information with deep analysis.",
-        "-o": "Optimize this solution for maximum performance, efficiency, and adherence to best practices. Consider scalability and maintainability.",
-        "-t": "Think through this step-by-step with careful reasoning and logical analysis. Break down complex problems into manageable parts.",
-        "-p": "Create a detailed, actionable plan with clear steps, milestones, dependencies, and success criteria. Include risk assessment and contingencies.",
-        "--rules": "MANDATORY: Strictly follow all AI development rules in ~/claude-automations/rules.md. Apply ALL rules: Planning & Discovery (research first), Code Quality & Security (NIST compliance), Workflow & Process (review before deploy), Testing & Validation (test-driven development), Documentation & Compliance (EU AI Act), Dependency & Architecture (no duplicates), and AI-Specific Development (responsible AI). These rules are NON-NEGOTIABLE."
-    }
-    
     try:
-        
         # Get user prompt from environment variable
         user_prompt = os.environ.get("CLAUDE_USER_PROMPT", "")
         
-        # Process switches in the prompt
-        for switch, replacement in switches.items():
-            if switch in user_prompt:
-                # Replace the switch with the expanded text
-                expanded_prompt = user_prompt.replace(switch, replacement)
-                print(f"[Switch Processor] Expanded '{switch}' to '{replacement}'")
-                # Set the expanded prompt back to environment
-                os.environ["CLAUDE_USER_PROMPT"] = expanded_prompt
+        # Every switch starts with '-'; most prompts have none
+        if '-' not in user_prompt:
+            return
+        
+        # Expand every switch in a single pass over the prompt
+        expanded = []
+        
+        def expand(match):
+            switch = match.group(0)
+            expanded.append(switch)
+            return SWITCHES[switch]
+        
+        expanded_prompt = SWITCH_PATTERN.sub(expand, user_prompt)
+        
+        for switch in dict.fromkeys(expanded):
+            print(f"[Switch Processor] Expanded '{switch}' to '{SWITCHES[switch]}'")
+        
+        if expanded:
+            # Set the expanded prompt back to environment
+            os.environ["CLAUDE_USER_PROMPT"] = expanded_prompt
                 
     except Exception as e:
         print(f"[Switch Processor] Error: {e}")
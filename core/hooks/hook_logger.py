@@ -7,21 +7,230 @@ Provides observability into what's running, when, and if it fails.
 import os
 import sys
 import json
-import traceback
+import time
+import queue
+import atexit
+import sqlite3
+import threading
 from datetime import datetime
 from pathlib import Path
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
 
+def _dumps_fallback(obj: Any) -> bytes:
+    """Serialize with the stdlib, stringifying whatever it cannot encode"""
+    try:
+        return json.dumps(obj, separators=(",", ":"), default=str).encode()
+    except (TypeError, ValueError):
+        # Unsupported keys or circular references
+        return json.dumps(repr(obj)).encode()
+
+
+# orjson is optional; both paths serialize straight to compact bytes. Log calls
+# carry arbitrary kwargs, so serialization falls back rather than raising.
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return _dumps_fallback(obj)
+    
+    _loads = orjson.loads
+except ImportError:
+    _dumps = _dumps_fallback
+    _loads = json.loads
+
 # Configuration
 LOG_DIR = Path.home() / ".claude" / "logs"
 LOG_FILE = LOG_DIR / "hooks.log"
-JSON_LOG_FILE = LOG_DIR / "hooks.json"
+JSON_LOG_DB = LOG_DIR / "hooks.db"  # Structured entries in SQLite (WAL)
 MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_JSON_ENTRIES = 1000
+
+# The trigger caps the table at MAX_JSON_ENTRIES rows with an indexed range delete
+JSON_LOG_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS logs (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        hook TEXT NOT NULL,
+        level TEXT NOT NULL,
+        json BLOB NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_logs_ts ON logs(ts);
+    CREATE TRIGGER IF NOT EXISTS logs_cap AFTER INSERT ON logs BEGIN
+        DELETE FROM logs WHERE id <= NEW.id - {MAX_JSON_ENTRIES};
+    END;
+"""
+
+BATCH_MAX_ENTRIES = 64
+BATCH_WAIT_SECONDS = 0.05
 
 # Create log directory if it doesn't exist
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Log writes are queued as (path, bytes) for the text log or (JSON_LOG_DB, row)
+# and written by one background thread, so a log call costs the caller an
+# enqueue rather than file I/O
+_queue = queue.SimpleQueue()
+_writer = None
+_writer_lock = threading.Lock()
+_STOP = object()
+
+# O_APPEND descriptors kept open by the writer thread, with per-file write counts
+_fds = {}
+_write_counts = {}
+_db = None  # Writer thread's SQLite connection
+
+
+def _enqueue(file_path: Path, data):
+    """Queue a write for the background writer, starting it if needed."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="hook-logger", daemon=True)
+                _writer.start()
+                atexit.register(_stop_writer)
+    _queue.put((file_path, data))
+
+
+def _writer_loop():
+    """Collect queued writes into batches and flush each batch."""
+    while True:
+        item = _queue.get()
+        batch = []
+        deadline = time.monotonic() + BATCH_WAIT_SECONDS
+        while item is not _STOP:
+            batch.append(item)
+            timeout = deadline - time.monotonic()
+            if len(batch) >= BATCH_MAX_ENTRIES or timeout <= 0:
+                break
+            try:
+                item = _queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+        _write_batch(batch)
+        if item is _STOP:
+            _close_files()
+            return
+
+
+def _write_batch(batch):
+    """Append a batch with one write per file and one transaction for the database."""
+    chunks = {}
+    for file_path, data in batch:
+        chunks.setdefault(file_path, []).append(data)
+        
+    for file_path, parts in chunks.items():
+        try:
+            if file_path == JSON_LOG_DB:
+                _insert_rows(parts)
+            else:
+                _rotate_if_needed(file_path)
+                _append(file_path, b"".join(parts))
+        except Exception as e:
+            # Silent failure - don't break the hook
+            pass
+
+
+def _connect_db() -> sqlite3.Connection:
+    """Open the structured log database, creating its schema if needed."""
+    conn = sqlite3.connect(JSON_LOG_DB, isolation_level=None, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(JSON_LOG_SCHEMA)
+    return conn
+
+
+def _insert_rows(rows):
+    """Insert (ts, hook, level, json) rows in a single transaction."""
+    global _db
+    if _db is None:
+        _db = _connect_db()
+    with _db:
+        _db.executemany("INSERT INTO logs (ts, hook, level, json) VALUES (?, ?, ?, ?)", rows)
+
+
+def _open_log(file_path: Path) -> int:
+    """Cached O_APPEND descriptor for a log file."""
+    fd = _fds.get(file_path)
+    if fd is None:
+        fd = _fds[file_path] = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    return fd
+
+
+def _close_log(file_path: Path):
+    """Drop the cached descriptor once the file has been moved or replaced."""
+    fd = _fds.pop(file_path, None)
+    if fd is not None:
+        os.close(fd)
+
+
+def _close_files():
+    """Close every cached descriptor and the database connection."""
+    global _db
+    for file_path in list(_fds):
+        _close_log(file_path)
+    if _db is not None:
+        _db.close()
+        _db = None
+
+
+def _append(file_path: Path, data: bytes):
+    """Append bytes to a file with a single os.write."""
+    os.write(_open_log(file_path), data)
+
+
+def _rotate_if_needed(file_path: Path):
+    """Move a log aside once it grows past MAX_LOG_SIZE."""
+    # Size is only checked on the first and every 256th batch for the file
+    count = _write_counts.get(file_path, 0)
+    _write_counts[file_path] = count + 1
+    if count & 0xFF:
+        return
+    
+    st = os.fstat(_open_log(file_path))
+    if st.st_size > MAX_LOG_SIZE:
+        _close_log(file_path)
+        # Another hook process may have rotated this file already; only move
+        # it aside if the path still names the file that grew too large
+        try:
+            current = os.stat(file_path)
+        except FileNotFoundError:
+            return
+        if (current.st_dev, current.st_ino) == (st.st_dev, st.st_ino):
+            backup = file_path.with_suffix(f".{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.bak")
+            os.replace(file_path, backup)
+
+
+def _stop_writer():
+    """Flush queued writes before the interpreter exits."""
+    _queue.put(_STOP)
+    _writer.join(timeout=2)
+
+
+
+# Descriptors for append_log, used by hooks that write their own log files. Kept
+# apart from _fds, which belongs to the background writer thread.
+_append_fds = {}
+
+
+def append_log(path, line: str):
+    """Append a line to a log file with a single write on a cached O_APPEND fd."""
+    fd = _append_fds.get(path)
+    if fd is None:
+        fd = _append_fds[path] = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    os.write(fd, line.encode())
+
+
+@atexit.register
+def _close_append_logs():
+    """Close append_log descriptors on exit."""
+    for fd in _append_fds.values():
+        os.close(fd)
+    _append_fds.clear()
+
 
 class HookLogger:
     """Centralized logger for Claude Code hooks."""
@@ -29,17 +238,20 @@ class HookLogger:
     def __init__(self, hook_name: str):
         """Initialize logger for a specific hook."""
         self.hook_name = hook_name
+        self._hook_prefix = f"[{hook_name}]"
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.start_time = None
+        self._t0 = None  # perf_counter_ns() at start(), for durations
         
     def log(self, level: str, message: str, **kwargs):
         """Log a message with additional metadata."""
-        timestamp = datetime.now().isoformat()
+        # One clock read per entry, shared by both logs
+        now = datetime.now()
+        timestamp = now.isoformat()
         
         # Human-readable log
-        log_entry = f"[{timestamp}] [{level}] [{self.hook_name}] {message}"
+        log_entry = f"[{timestamp}] [{level}] {self._hook_prefix} {message}"
         if kwargs:
-            log_entry += f" | {json.dumps(kwargs)}"
+            log_entry += f" | {_dumps(kwargs).decode()}"
         
         # Write to text log
         self._write_log(LOG_FILE, log_entry + "\n")
@@ -55,74 +267,51 @@ class HookLogger:
         }
         
         # Write to JSON log
-        self._write_json_log(json_entry)
+        self._write_json_log(json_entry, now.timestamp())
         
     def _write_log(self, file_path: Path, content: str):
-        """Write to log file with rotation."""
-        try:
-            # Check file size and rotate if needed
-            if file_path.exists() and file_path.stat().st_size > MAX_LOG_SIZE:
-                # Rotate log
-                backup = file_path.with_suffix(f".{datetime.now().strftime('%Y%m%d_%H%M%S')}.bak")
-                file_path.rename(backup)
-                
-            # Append to log
-            with open(file_path, "a") as f:
-                f.write(content)
-        except Exception as e:
-            # Silent failure - don't break the hook
-            pass
+        """Queue a line for the log file (rotated by the writer thread)."""
+        _enqueue(file_path, content.encode())
             
-    def _write_json_log(self, entry: Dict[str, Any]):
-        """Write structured JSON log."""
+    def _write_json_log(self, entry: Dict[str, Any], ts: float):
+        """Queue structured JSON log entry."""
         try:
-            # Read existing logs
-            logs = []
-            if JSON_LOG_FILE.exists():
-                try:
-                    with open(JSON_LOG_FILE, "r") as f:
-                        logs = json.load(f)
-                except:
-                    logs = []
-                    
-            # Add new entry
-            logs.append(entry)
-            
-            # Keep only last 1000 entries
-            if len(logs) > 1000:
-                logs = logs[-1000:]
-                
-            # Write back
-            with open(JSON_LOG_FILE, "w") as f:
-                json.dump(logs, f, indent=2)
+            _enqueue(JSON_LOG_DB, (ts, entry["hook"], entry["level"], _dumps(entry)))
         except Exception as e:
             # Silent failure
             pass
             
     def start(self, context: Optional[Dict[str, Any]] = None):
         """Log hook start."""
-        self.start_time = datetime.now()
+        self._t0 = time.perf_counter_ns()
         self.log("INFO", f"Hook started", context=context or {})
         
+    def _duration(self) -> Optional[float]:
+        """Seconds since start(), or None if the hook was never started."""
+        if self._t0 is None:
+            return None
+        return (time.perf_counter_ns() - self._t0) / 1e9
+        
     def success(self, message: str = "Hook completed successfully", **kwargs):
         """Log successful completion."""
-        duration = None
-        if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
-        self.log("SUCCESS", message, duration_seconds=duration, **kwargs)
+        self.log("SUCCESS", message, duration_seconds=self._duration(), **kwargs)
         
     def error(self, error: Exception, message: str = "Hook failed"):
         """Log error with traceback."""
-        duration = None
-        if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
+        duration = self._duration()
+            
+        # Formatting the traceback walks every frame; only pay for it when debugging
+        tb = None
+        if os.environ.get("CLAUDE_DEBUG") == "true":
+            import traceback
+            tb = traceback.format_exc()
             
         self.log(
             "ERROR",
             message,
             error_type=type(error).__name__,
             error_message=str(error),
-            traceback=traceback.format_exc(),
+            traceback=tb,
             duration_seconds=duration
         )
         
@@ -150,6 +339,7 @@ def logged_hook(hook_name: Optional[str] = None):
                     "args": str(args)[:200],  # Truncate long args
                     "kwargs": str(kwargs)[:200],
                     "cwd": os.getcwd(),
+                    # Read per call; long-lived importers outlive the environment they started with
                     "env_vars": {
                         k: v for k, v in os.environ.items()
                         if "CLAUDE" in k or "HOOK" in k
@@ -177,25 +367,30 @@ def logged_hook(hook_name: Optional[str] = None):
 def get_recent_logs(hours: int = 24, hook_filter: Optional[str] = None) -> list:
     """Get recent log entries."""
     try:
-        if not JSON_LOG_FILE.exists():
+        if not JSON_LOG_DB.exists():
             return []
             
-        with open(JSON_LOG_FILE, "r") as f:
-            logs = json.load(f)
-            
-        # Filter by time
+        # Filter by time (indexed) and hook name substring
         cutoff = datetime.now().timestamp() - (hours * 3600)
-        recent = []
+        query = "SELECT json FROM logs WHERE ts >= ?"
+        params = [cutoff]
+        if hook_filter:
+            query += " AND instr(hook, ?) > 0"
+            params.append(hook_filter)
+        query += " ORDER BY id"
         
-        for log in logs:
+        conn = sqlite3.connect(JSON_LOG_DB, timeout=5)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+            
+        recent = []
+        for (data,) in rows:
             try:
-                log_time = datetime.fromisoformat(log["timestamp"]).timestamp()
-                if log_time >= cutoff:
-                    if not hook_filter or hook_filter in log["hook"]:
-                        recent.append(log)
-            except:
+                recent.append(_loads(data))
+            except ValueError:
                 continue
-                
         return recent
     except:
         return []
@@ -219,29 +414,30 @@ def print_summary():
             summary[hook] = {"SUCCESS": 0, "ERROR": 0, "WARNING": 0, "INFO": 0}
         summary[hook][level] = summary[hook].get(level, 0) + 1
         
-    # Print summary
-    print(f"\n📊 Hook Activity Summary (Last 24 Hours)")
-    print("=" * 50)
+    # Build the summary, then print it with a single write
+    out = [f"\n📊 Hook Activity Summary (Last 24 Hours)", "=" * 50]
     
     for hook, counts in summary.items():
         total = sum(counts.values())
         success_rate = (counts["SUCCESS"] / total * 100) if total > 0 else 0
         
-        print(f"\n{hook}:")
-        print(f"  Total runs: {total}")
-        print(f"  Success: {counts['SUCCESS']} ({success_rate:.1f}%)")
+        out.append(f"\n{hook}:")
+        out.append(f"  Total runs: {total}")
+        out.append(f"  Success: {counts['SUCCESS']} ({success_rate:.1f}%)")
         if counts["ERROR"]:
-            print(f"  ❌ Errors: {counts['ERROR']}")
+            out.append(f"  ❌ Errors: {counts['ERROR']}")
         if counts["WARNING"]:
-            print(f"  ⚠️  Warnings: {counts['WARNING']}")
+            out.append(f"  ⚠️  Warnings: {counts['WARNING']}")
             
     # Recent errors
     errors = [l for l in logs if l.get("level") == "ERROR"]
     if errors:
-        print(f"\n\n❌ Recent Errors:")
-        print("-" * 50)
+        out.append(f"\n\n❌ Recent Errors:")
+        out.append("-" * 50)
         for error in errors[-5:]:  # Last 5 errors
-            print(f"  [{error['timestamp']}] {error['hook']}: {error.get('error_message', 'Unknown error')}")
+            out.append(f"  [{error['timestamp']}] {error['hook']}: {error.get('error_message', 'Unknown error')}")
+            
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -11,10 +11,50 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
-# Add git-intelligence to path
+from background_command import spawn, collect
+
+# orjson is optional; both paths serialize straight to bytes
+try:
+    import orjson
+    
+    def _dumps_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dumps_line(obj):
+        return json.dumps(obj).encode() + b"\n"
+
+# Add git-intelligence to path; SmartMergeManager is only imported when a
+# merge has conflicts to resolve
 sys.path.insert(0, '/Users/umasankrudhya/claude-automations/git-intelligence/src')
 
-from smart_merge import SmartMergeManager
+CLAUDE_DIR = Path.home() / ".claude"
+
+MERGE_STATUS_COMMAND = [
+    "git", "--no-optional-locks", "status", "--porcelain=v2", "--branch", "-uno", "-z"
+]
+
+
+def read_merge_status():
+    """Branch, HEAD commit and unmerged paths from a single git status call"""
+    status = {"branch": "", "head": None, "conflict_files": []}
+    result = subprocess.run(MERGE_STATUS_COMMAND, capture_output=True)
+    if result.returncode != 0:
+        return status
+    
+    records = iter(result.stdout.split(b"\0"))
+    for record in records:
+        if record.startswith(b"# branch.oid "):
+            oid = record[len(b"# branch.oid "):].decode()
+            if oid != "(initial)":
+                status["head"] = oid
+        elif record.startswith(b"# branch.head "):
+            head = os.fsdecode(record[len(b"# branch.head "):])
+            status["branch"] = "HEAD" if head == "(detached)" else head
+        elif record.startswith(b"2 "):
+            next(records, None)  # Skip the rename/copy source path
+        elif record.startswith(b"u "):
+            status["conflict_files"].append(os.fsdecode(record.split(b" ", 10)[10]))
+    return status
 
 
 def detect_merge_in_progress():
@@ -31,7 +71,7 @@ def detect_merge_in_progress():
     return any(marker.exists() for marker in merge_markers)
 
 
-def get_merge_info():
+def get_merge_info(status):
     """Get information about the pending merge"""
     info = {
         "source": "",
@@ -41,48 +81,34 @@ def get_merge_info():
     }
     
     try:
-        # Get current branch (target)
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            info["target"] = result.stdout.strip()
+        # The staged-change count and the source branch lookup run concurrently
+        numstat_process = spawn(["git", "diff", "--cached", "--numstat"])
         
         # Get merge head (source)
-        merge_head_file = Path(".git/MERGE_HEAD")
-        if merge_head_file.exists():
-            with open(merge_head_file, 'r') as f:
+        name_rev_process = None
+        try:
+            with open(".git/MERGE_HEAD", 'r') as f:
                 merge_commit = f.read().strip()
-            
+        except FileNotFoundError:
+            pass
+        else:
             # Get branch name for commit
-            result = subprocess.run(
-                ["git", "name-rev", "--name-only", merge_commit],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                info["source"] = result.stdout.strip()
+            name_rev_process = spawn(["git", "name-rev", "--name-only", merge_commit])
         
-        # Check for conflicts
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "--diff-filter=U"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0 and result.stdout.strip():
+        # Current branch (target) and conflicts come from git status
+        info["target"] = status["branch"]
+        if status["conflict_files"]:
             info["conflicts"] = True
-            info["conflict_files"] = result.stdout.strip().split('\n')
+            info["conflict_files"] = status["conflict_files"]
+        
+        stdout = collect(name_rev_process)
+        if stdout is not None:
+            info["source"] = stdout.decode().strip()
         
         # Count files changed
-        result = subprocess.run(
-            ["git", "diff", "--cached", "--numstat"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            info["files_changed"] = len(result.stdout.strip().split('\n'))
+        stdout = collect(numstat_process)
+        if stdout is not None:
+            info["files_changed"] = len(stdout.strip().split(b'\n'))
             
     except:
         pass
@@ -90,35 +116,24 @@ def get_merge_info():
     return info
 
 
-def create_pre_merge_backup():
+def create_pre_merge_backup(status):
     """Create a backup before merge"""
     try:
-        backup_dir = Path.home() / ".claude" / "smart-genie-merge-backups"
+        backup_dir = CLAUDE_DIR / "smart-genie-merge-backups"
         backup_dir.mkdir(parents=True, exist_ok=True)
         
         # Create backup ID
-        backup_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Save current state
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True
-        )
+        now = datetime.now()
+        backup_id = now.strftime("%Y%m%d_%H%M%S")
         
-        if result.returncode == 0:
-            current_commit = result.stdout.strip()
-            
+        # Save current state (HEAD and branch already read by git status)
+        if status["head"] is not None:
             # Save backup info
             backup_info = {
                 "id": backup_id,
-                "timestamp": datetime.now().isoformat(),
-                "commit": current_commit,
-                "branch": subprocess.run(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    capture_output=True,
-                    text=True
-                ).stdout.strip()
+                "timestamp": now.isoformat(),
+                "commit": status["head"],
+                "branch": status["branch"]
             }
             
             backup_file = backup_dir / f"{backup_id}.json"
@@ -133,20 +148,24 @@ def create_pre_merge_backup():
     return None
 
 
+# Conflict resolution hint by file type
+SUFFIX_HINTS = {
+    ".json": "Check JSON structure after resolution",
+    ".py": "Verify imports and function signatures",
+    ".js": "Verify imports and function signatures",
+    ".ts": "Verify imports and function signatures",
+    ".md": "Documentation conflict - merge both versions?",
+}
+
+
 def suggest_conflict_resolution(conflict_files):
     """Suggest how to resolve conflicts"""
     suggestions = []
     
     for file in conflict_files:
         # Analyze file type
-        if file.endswith('.json'):
-            suggestions.append(f"  • {file}: Check JSON structure after resolution")
-        elif file.endswith(('.py', '.js', '.ts')):
-            suggestions.append(f"  • {file}: Verify imports and function signatures")
-        elif file.endswith('.md'):
-            suggestions.append(f"  • {file}: Documentation conflict - merge both versions?")
-        else:
-            suggestions.append(f"  • {file}: Review changes carefully")
+        hint = SUFFIX_HINTS.get(os.path.splitext(file)[1], "Review changes carefully")
+        suggestions.append(f"  • {file}: {hint}")
     
     return suggestions
 
@@ -158,11 +177,14 @@ def main():
         if not detect_merge_in_progress():
             return
         
+        # Branch, HEAD and conflicts for both the info and the backup
+        status = read_merge_status()
+        
         # Get merge information
-        merge_info = get_merge_info()
+        merge_info = get_merge_info(status)
         
         # Create backup
-        backup_id = create_pre_merge_backup()
+        backup_id = create_pre_merge_backup(status)
         
         if backup_id:
             print(f"\n💾 Merge backup created: {backup_id}")
@@ -173,6 +195,7 @@ def main():
             print(f"\n⚠️ Merge conflicts detected in {len(merge_info.get('conflict_files', []))} files")
             
             # Initialize merge manager for auto-resolution
+            from smart_merge import SmartMergeManager
             manager = SmartMergeManager()
             
             # Check if auto-resolution is enabled
@@ -183,26 +206,32 @@ def main():
                     print("✅ Conflicts auto-resolved successfully!")
                     print("   Review changes before completing merge")
                 else:
-                    print("❌ Could not auto-resolve all conflicts")
-                    print("\n📝 Conflict resolution suggestions:")
-                    
                     suggestions = suggest_conflict_resolution(merge_info.get('conflict_files', []))
-                    for suggestion in suggestions[:5]:
-                        print(suggestion)
                     
-                    print("\n💡 Options:")
-                    print("   1. Fix conflicts manually")
-                    print("   2. Abort merge: git merge --abort")
-                    print("   3. Use /merge resolve for assistance")
+                    # Emit the whole report with a single write
+                    out = [
+                        "❌ Could not auto-resolve all conflicts",
+                        "\n📝 Conflict resolution suggestions:",
+                        *suggestions[:5],
+                        "\n💡 Options:",
+                        "   1. Fix conflicts manually",
+                        "   2. Abort merge: git merge --abort",
+                        "   3. Use /merge resolve for assistance",
+                    ]
+                    sys.stdout.write("\n".join(out) + "\n")
             else:
-                print("\n💡 Auto-resolution disabled. Fix conflicts manually or:")
-                print("   • Enable auto-resolution in config")
-                print("   • Use: git merge --abort to cancel")
+                sys.stdout.write(
+                    "\n💡 Auto-resolution disabled. Fix conflicts manually or:\n"
+                    "   • Enable auto-resolution in config\n"
+                    "   • Use: git merge --abort to cancel\n"
+                )
         else:
             # No conflicts, safe to proceed
-            print(f"\n✅ Merge safety check passed")
-            print(f"   Merging {merge_info['source']} → {merge_info['target']}")
-            print(f"   Files affected: {merge_info['files_changed']}")
+            sys.stdout.write(
+                f"\n✅ Merge safety check passed\n"
+                f"   Merging {merge_info['source']} → {merge_info['target']}\n"
+                f"   Files affected: {merge_info['files_changed']}\n"
+            )
         
         # Log the merge
         log_entry = {
@@ -214,11 +243,11 @@ def main():
         }
         
         # Write to log
-        log_file = Path.home() / ".claude" / "smart-genie-merges.log"
+        log_file = CLAUDE_DIR / "smart-genie-merges.log"
         log_file.parent.mkdir(exist_ok=True)
         
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(log_entry) + "\n")
+        with open(log_file, 'ab') as f:
+            f.write(_dumps_line(log_entry))
             
     except Exception as e:
         # Silent failure
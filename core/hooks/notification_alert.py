@@ -2,6 +2,9 @@
 """
 Claude Code Completion Alert System
 Provides audible alerts for important Claude Code events
+
+Exits without reading the event when no speech backend is available or
+CLAUDE_DISABLE_ALERTS is set to 1/true.
 """
 
 import json
@@ -9,13 +12,58 @@ import sys
 import os
 import subprocess
 import platform
+import shlex
+import shutil
 import re
 from datetime import datetime
 from pathlib import Path
 
+# Phrases that mean Claude finished or is waiting on the user
+NOTIFY_PHRASES = [
+    'task complete',
+    'session complete', 
+    'waiting for input',
+    'awaiting input',
+    'user input required',
+    'ready for next command',
+    'finished processing',
+    'operation complete',
+    'claude code stopped',
+    'claude needs attention',
+    'completed successfully',
+    'finished',
+    'done',
+    'ready'
+]
+NOTIFY_EVENTS = frozenset(["Notification", "Stop"])
+ALERT_WORDS = ['blocked', 'error', 'failed', 'critical', 'warning']
+
+# Substring matches, as before: one scan of the message per list
+_NOTIFY_RE = re.compile("|".join(map(re.escape, NOTIFY_PHRASES)), re.IGNORECASE)
+_ALERT_RE = re.compile("|".join(map(re.escape, ALERT_WORDS)), re.IGNORECASE)
+
+# Summary patterns, tried in order; the first one that matches wins
+SUMMARY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    # File operations - more specific patterns
+    r'created\s+([^.]+?)(?:\s+(?:file|component|function|system)|$)',
+    r'updated\s+([^.]+?)(?:\s+(?:file|files|with|to)|$)',
+    r'fixed\s+([^.]+?)(?:\s+(?:bug|issue|problem|in)|$)',
+    r'implemented\s+([^.]+?)(?:\s+(?:feature|functionality|using|with)|$)',
+    r'added\s+([^.]+?)(?:\s+(?:to|for|in)|$)',
+    r'configured\s+([^.]+?)(?:\s+(?:with|for|in)|$)',
+    r'installed\s+([^.]+?)(?:\s+(?:successfully|with|for)|$)',
+    r'optimized\s+([^.]+?)(?:\s+(?:for|performance|queries)|$)',
+    r'analyzed\s+([^.]+?)(?:\s+(?:and|performance|data)|$)',
+]]
+KEY_ACTIONS = ['created', 'updated', 'fixed', 'implemented', 'installed', 'configured', 'optimized', 'analyzed']
+_WS = re.compile(r'\s+')
+
+# The platform never changes within a process
+_PLATFORM = platform.system()
+
 def should_notify(data):
     """Determine if this event should trigger an alert"""
-    message = data.get("message", "").lower()
+    message = data.get("message", "")
     hook_event = data.get("hook_event_name", "")
     
     # Always notify for:
@@ -24,33 +72,11 @@ def should_notify(data):
     # 3. Tool execution blocked
     # 4. Errors
     # 5. Stop events
-    if any(phrase in message for phrase in [
-        'task complete',
-        'session complete', 
-        'waiting for input',
-        'awaiting input',
-        'user input required',
-        'ready for next command',
-        'finished processing',
-        'operation complete',
-        'claude code stopped',
-        'claude needs attention',
-        'completed successfully',
-        'finished',
-        'done',
-        'ready'
-    ]):
-        return True
-    
-    # Notification and Stop hook events
-    if hook_event in ["Notification", "Stop"]:
-        return True
-    
-    # Block/error events
-    if any(word in message for word in ['blocked', 'error', 'failed', 'critical', 'warning']):
-        return True
-    
-    return False
+    return (
+        hook_event in NOTIFY_EVENTS
+        or _NOTIFY_RE.search(message) is not None
+        or _ALERT_RE.search(message) is not None
+    )
 
 def get_project_context():
     """Get current project folder and context"""
@@ -72,33 +98,19 @@ def extract_task_summary(message):
         return ""
     
     # Look for common completion patterns and extract key info
-    patterns = [
-        # File operations - more specific patterns
-        r'created\s+([^.]+?)(?:\s+(?:file|component|function|system)|$)',
-        r'updated\s+([^.]+?)(?:\s+(?:file|files|with|to)|$)',
-        r'fixed\s+([^.]+?)(?:\s+(?:bug|issue|problem|in)|$)',
-        r'implemented\s+([^.]+?)(?:\s+(?:feature|functionality|using|with)|$)',
-        r'added\s+([^.]+?)(?:\s+(?:to|for|in)|$)',
-        r'configured\s+([^.]+?)(?:\s+(?:with|for|in)|$)',
-        r'installed\s+([^.]+?)(?:\s+(?:successfully|with|for)|$)',
-        r'optimized\s+([^.]+?)(?:\s+(?:for|performance|queries)|$)',
-        r'analyzed\s+([^.]+?)(?:\s+(?:and|performance|data)|$)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, message, re.IGNORECASE)
+    for pattern in SUMMARY_PATTERNS:
+        match = pattern.search(message)
         if match:
             summary = match.group(1).strip()
             # Clean up and limit to key words
-            summary = re.sub(r'\s+', ' ', summary)  # normalize whitespace
+            summary = _WS.sub(' ', summary)  # normalize whitespace
             words = summary.split()[:3]  # Take first 3 words for brevity
             result = ' '.join(words)
             return result if len(result) > 2 else ""
     
     # Fallback: look for key action words
-    key_actions = ['created', 'updated', 'fixed', 'implemented', 'installed', 'configured', 'optimized', 'analyzed']
     message_lower = message.lower()
-    for action in key_actions:
+    for action in KEY_ACTIONS:
         if action in message_lower:
             return action
     
@@ -134,40 +146,66 @@ def get_voice_message(data):
         # Default alert
         return f"Claude Code alert in {project_folder}"
 
-def play_alert_sound(voice_message, priority="normal"):
-    """Play alert using system sound commands"""
-    try:
-        if platform.system() == "Darwin":  # macOS
-            # First play a system sound to get attention
-            subprocess.run(["afplay", "/System/Library/Sounds/Glass.aiff"], capture_output=True, check=False)
-            
+def speak_in_background(command):
+    """Start an alert command detached from the hook, without waiting for it"""
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+_GLASS_SOUND = "/System/Library/Sounds/Glass.aiff"
+
+def _make_speaker():
+    """Pick the alert backend for this machine once; None when there is none"""
+    # Speech takes seconds, so each alert runs as one detached process and
+    # the hook returns as soon as it has started
+    if _PLATFORM == "Darwin":  # macOS
+        # First play a system sound to get attention
+        chime = f"afplay {_GLASS_SOUND}; " if os.path.exists(_GLASS_SOUND) else ""
+        
+        def speak(voice_message, priority):
             # Use different voices for different priorities
             if priority == "high":
-                voice = "Victoria"
-                rate = "160"
+                voice, rate = "Victoria", "160"
             else:
-                voice = "Alex" 
-                rate = "180"
-            
-            # Use say command with voice and rate
-            subprocess.run([
-                "say", "-v", voice, "-r", rate, voice_message
-            ], capture_output=True, check=False)
-            
-        elif platform.system() == "Linux":
-            # Try different Linux TTS options
-            if subprocess.run(["which", "pico2wave"], capture_output=True).returncode == 0:
-                temp_file = "/tmp/claude_alert.wav"
-                subprocess.run(["pico2wave", "-w", temp_file, voice_message], capture_output=True)
-                subprocess.run(["aplay", temp_file], capture_output=True)
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
-            elif subprocess.run(["which", "espeak"], capture_output=True).returncode == 0:
-                speed = "150" if priority == "high" else "175"
-                subprocess.run(["espeak", "-s", speed, voice_message], capture_output=True)
+                voice, rate = "Alex", "180"
+            speak_in_background([
+                "/bin/sh", "-c",
+                f"{chime}say -v {voice} -r {rate} {shlex.quote(voice_message)}"
+            ])
+        return speak
+    
+    if _PLATFORM == "Linux":
+        # Try different Linux TTS options
+        if shutil.which("pico2wave"):
+            def speak(voice_message, priority):
+                # Alerts can overlap, so each shell gets its own file
+                temp_file = "/tmp/claude_alert.$$.wav"
+                speak_in_background([
+                    "/bin/sh", "-c",
+                    f"pico2wave -w {temp_file} {shlex.quote(voice_message)}; "
+                    f"aplay {temp_file}; rm -f {temp_file}"
+                ])
+            return speak
         
+        if shutil.which("espeak"):
+            def speak(voice_message, priority):
+                speed = "150" if priority == "high" else "175"
+                speak_in_background(["espeak", "-s", speed, voice_message])
+            return speak
+    
+    return None
+
+_SPEAK = _make_speaker()
+
+def play_alert_sound(voice_message, priority="normal"):
+    """Play alert using system sound commands"""
+    try:
+        if _SPEAK is not None:
+            _SPEAK(voice_message, priority)
     except Exception as e:
         # Fallback to system bell if voice fails
         try:
@@ -177,6 +215,10 @@ def play_alert_sound(voice_message, priority="normal"):
 
 def main():
     """Main entry point for notification hook"""
+    # Nothing could be played, so skip parsing and message building
+    if _SPEAK is None or os.environ.get("CLAUDE_DISABLE_ALERTS") in ("1", "true"):
+        sys.exit(0)
+    
     try:
         # Read hook input data
         data = json.load(sys.stdin)
@@ -9,30 +9,42 @@ import os
 import sys
 from pathlib import Path
 
+HOOKS_DIR = Path.home() / '.claude' / 'hooks'
+
 def start_automated_session():
     """Start all automation for the current project"""
     
     print("🚀 Starting Claude Code automation suite...")
     
-    # 1. Load code intelligence manifests
+    # 1. Load code intelligence manifests and 2. start session lifecycle
+    # management; the two are independent, so they run concurrently
     print("📊 Loading code intelligence...")
-    try:
-        subprocess.run([
-            'python3', str(Path.home() / '.claude' / 'hooks' / 'pre-agent-context.py')
-        ], check=True)
-        print("✅ Code intelligence loaded")
-    except Exception as e:
-        print(f"⚠️ Code intelligence loading failed: {e}")
-    
-    # 2. Start session lifecycle management
     print("🔄 Starting session management...")
-    try:
-        subprocess.run([
-            str(Path.home() / '.claude' / 'hooks' / 'claude-session-auto-start.sh'), 'start'
-        ], check=True)
-        print("✅ Session management started")
-    except Exception as e:
-        print(f"⚠️ Session management failed: {e}")
+    steps = [
+        ("Code intelligence loading", "✅ Code intelligence loaded",
+         [sys.executable, str(HOOKS_DIR / 'pre-agent-context.py')]),
+        ("Session management", "✅ Session management started",
+         [str(HOOKS_DIR / 'claude-session-auto-start.sh'), 'start']),
+    ]
+    # Each step's output is captured and shown in order, so the two never interleave
+    processes = []
+    for _, _, command in steps:
+        try:
+            processes.append(subprocess.Popen(command, stdout=subprocess.PIPE, text=True))
+        except Exception as e:
+            processes.append(e)
+    
+    for (name, success, command), process in zip(steps, processes):
+        if isinstance(process, Exception):
+            print(f"⚠️ {name} failed: {process}")
+            continue
+        output, _ = process.communicate()
+        if output:
+            print(output, end='', flush=True)
+        if process.returncode != 0:
+            print(f"⚠️ {name} failed: {subprocess.CalledProcessError(process.returncode, command)}")
+        else:
+            print(success)
     
     # 3. Check deployment status
     print("🔍 Checking deployment status...")
@@ -8,52 +8,175 @@ Lightweight check that delegates to smart-auto-commit.
 import os
 import sys
 import json
+import re
+import time
 import subprocess
 from pathlib import Path
 from datetime import datetime
 
 # Add hook logger to path
 sys.path.insert(0, str(Path.home() / 'claude-automations' / 'core' / 'hooks'))
-from hook_logger import HookLogger
+
+# Tools that modify files; every other tool returns before the logger is loaded
+MODIFYING_TOOLS = frozenset({'Write', 'Edit', 'MultiEdit', 'NotebookEdit'})
+
+# One call answers "is this a repo", "how many entries changed" and "which
+# tracked files differ from the index"; untracked entries are counted the
+# same way the plain --porcelain listing counted them
+GIT_STATUS_COMMAND = ['git', '--no-optional-locks', 'status', '--porcelain=v2', '-z']
+
+STATE_FILE = Path.home() / '.claude' / 'auto-commit-state.json'
+
+# Edits arrive in bursts; within this window a status result is reused while the
+# index and HEAD are untouched and the edited file was already listed as changed
+STATUS_CACHE_SECONDS = 10
+REPO_CACHE_SIZE = 32  # Working directories whose git dir and top level are remembered
+
+# Important files, matched on the end of the path so that e.g. .mdx is not a .md
+IMPORTANT_FILE_PATTERN = re.compile(r'(?:\.ya?ml|\.md|package\.json|requirements\.txt|Dockerfile)$')
+
+
+def read_changes(stdout):
+    """Count status entries and list worktree-modified tracked paths
+
+    The path list matches what `git diff --name-only` printed: tracked files
+    whose worktree side (Y) differs from the index, plus unmerged paths.
+    """
+    entries = 0
+    changed_names = []
+    records = iter(stdout.split(b'\0'))
+    for record in records:
+        kind = record[:1]
+        if kind == b'1':
+            entries += 1
+            if record[3:4] != b'.':
+                changed_names.append(os.fsdecode(record.split(b' ', 8)[8]))
+        elif kind == b'2':
+            entries += 1
+            next(records, None)  # Skip the rename/copy source path
+            if record[3:4] != b'.':
+                changed_names.append(os.fsdecode(record.split(b' ', 9)[9]))
+        elif kind == b'u':
+            entries += 1
+            changed_names.append(os.fsdecode(record.split(b' ', 10)[10]))
+        elif kind == b'?':
+            entries += 1
+    return entries, changed_names
+
+
+def edited_path(hook_input):
+    """Path of the file the tool wrote, when the hook input carries one"""
+    tool_input = hook_input.get('tool_input') or hook_input.get('tool', {}).get('input') or {}
+    return tool_input.get('file_path') or tool_input.get('notebook_path')
+
+
+def find_repo(state, cwd):
+    """Absolute git dir and top level for cwd, remembered in the state file"""
+    repos = state.setdefault('repo_paths', {})
+    repo = repos.get(cwd)
+    if repo is None:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--absolute-git-dir', '--show-toplevel'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        repo = result.stdout.splitlines()
+        if len(repo) != 2:
+            return None
+        repos[cwd] = repo
+        for stale in list(repos)[:-REPO_CACHE_SIZE]:
+            del repos[stale]
+    return repo
+
+
+def status_key(cwd, git_dir):
+    """Working directory plus .git/index and .git/HEAD mtimes, None if either is missing"""
+    try:
+        return [cwd, os.stat(os.path.join(git_dir, 'index')).st_mtime_ns,
+                os.stat(os.path.join(git_dir, 'HEAD')).st_mtime_ns]
+    except OSError:
+        return None
+
+
+def cached_changes(state, key, toplevel, path):
+    """The last status result when it still describes the working tree, else None
+
+    Editing a file that was already modified leaves the status listing as it
+    was, so the result is only reused when the edited path is in it.
+    """
+    cache = state.get('status_cache')
+    if not cache or key is None or path is None or cache.get('key') != key:
+        return None
+    if time.time() - cache.get('time', 0) > STATUS_CACHE_SECONDS:
+        return None
+    path = os.path.relpath(os.path.realpath(path), os.path.realpath(toplevel))
+    if path not in cache['changed_names']:
+        return None
+    return cache['changed_files'], cache['changed_names']
+
 
 def main():
     """Check if auto-commit should run after edit."""
-    logger = HookLogger('post-edit-auto-commit')
-    
     try:
         # Get hook input from Claude Code
         hook_input = json.loads(os.environ.get('CLAUDE_HOOK_INPUT', '{}'))
         tool_name = hook_input.get('tool', {}).get('name', 'unknown')
+    except Exception as e:
+        input_error = e
+    else:
+        input_error = None
+        # Only proceed for file modification tools
+        if tool_name not in MODIFYING_TOOLS:
+            return 0
+    
+    from hook_logger import HookLogger
+    logger = HookLogger('post-edit-auto-commit')
+    
+    try:
+        if input_error is not None:
+            raise input_error
         
         logger.start({
             'tool': tool_name,
             'cwd': os.getcwd()
         })
         
-        # Only proceed for file modification tools
-        if tool_name not in ['Write', 'Edit', 'MultiEdit', 'NotebookEdit']:
-            logger.info(f"Skipping - tool {tool_name} doesn't modify files")
-            return 0
-            
-        # Check if we're in a git repository
-        result = subprocess.run(
-            ['git', 'rev-parse', '--git-dir'],
-            capture_output=True,
-            text=True
-        )
+        # Load or create state
+        state = {}
+        if STATE_FILE.exists():
+            try:
+                with open(STATE_FILE) as f:
+                    state = json.load(f)
+            except:
+                state = {}
         
-        if result.returncode != 0:
+        cwd = os.getcwd()
+        repo = find_repo(state, cwd)
+        if repo is None:
             logger.info("Not in a git repository")
             return 0
-            
-        # Check for uncommitted changes
-        result = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True,
-            text=True
-        )
+        git_dir, toplevel = repo
         
-        changed_files = len(result.stdout.strip().split('\n')) if result.stdout.strip() else 0
+        # Check for uncommitted changes, reusing the last status during a burst of edits
+        key = status_key(cwd, git_dir)
+        cached = cached_changes(state, key, toplevel, edited_path(hook_input))
+        if cached is not None:
+            changed_files, changed_names = cached
+        else:
+            result = subprocess.run(GIT_STATUS_COMMAND, capture_output=True)
+            
+            if result.returncode != 0:
+                logger.info("Not in a git repository")
+                return 0
+                
+            changed_files, changed_names = read_changes(result.stdout)
+            state['status_cache'] = {
+                'key': key,
+                'time': time.time(),
+                'changed_files': changed_files,
+                'changed_names': changed_names
+            }
         
         if changed_files == 0:
             logger.info("No uncommitted changes")
@@ -62,17 +185,6 @@ def main():
         logger.info(f"Found {changed_files} uncommitted files")
         
         # Check thresholds for auto-commit
-        STATE_FILE = Path.home() / '.claude' / 'auto-commit-state.json'
-        
-        # Load or create state
-        state = {}
-        if STATE_FILE.exists():
-            try:
-                with open(STATE_FILE) as f:
-                    state = json.load(f)
-            except:
-                state = {}
-                
         # Update file count
         last_count = state.get('last_file_count', 0)
         last_commit = state.get('last_commit_time', '')
@@ -87,16 +199,8 @@ def main():
             reason = f"file_threshold ({changed_files} files)"
             
         # Trigger 2: Important files modified
-        important_patterns = ['.md', 'package.json', 'requirements.txt', 'Dockerfile', '.yml', '.yaml']
-        result = subprocess.run(
-            ['git', 'diff', '--name-only'],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.stdout:
-            changed_names = result.stdout.strip().split('\n')
-            important_changed = [f for f in changed_names if any(p in f for p in important_patterns)]
+        if changed_names:
+            important_changed = [f for f in changed_names if IMPORTANT_FILE_PATTERN.search(f)]
             if important_changed:
                 should_commit = True
                 reason = f"important_files ({', '.join(important_changed[:3])}...)"
@@ -12,6 +12,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 import re
 
+from background_command import spawn, collect
+
 # Configuration
 DOCS_CONFIG = {
     'roadmap_file': 'PROJECT_ROADMAP.md',
@@ -23,13 +25,60 @@ DOCS_CONFIG = {
     'dev_docs_dir': 'docs/dev'
 }
 
+# Commit message keywords for each documentation category. Categories share
+# keywords, so every category is answered from a single scan of the message.
+COMMIT_CATEGORIES = {
+    'feature': {'feat', 'feature', 'add', 'new'},
+    'completed': {'feat', 'feature', 'complete', 'done', 'implement'},
+    'api': {'api', 'endpoint', 'route', 'graphql'},
+    'ui': {'ui', 'ux', 'user', 'interface', 'frontend'},
+    'breaking': {'break', 'breaking'},
+    'major': {'break', 'breaking', 'major'},
+    'architecture': {'architect', 'design', 'refactor', 'restructure'},
+    'decision': {'architect', 'design', 'refactor', 'restructure', 'decision', 'pattern'},
+    'deployment': {'deploy', 'docker', 'ci', 'cd', 'infra', 'config'},
+    'fix': {'fix', 'bug', 'patch'},
+    'bugfix': {'fix', 'bug', 'issue', 'patch'},
+}
+
+def splice(content, marker, replacement):
+    """Replace the first occurrence of marker, locating it with a single scan"""
+    offset = content.find(marker)
+    if offset == -1:
+        return content
+    return content[:offset] + replacement + content[offset + len(marker):]
+
+
 class DocumentationAutomator:
+    # Every keyword is alphanumeric, so each match is a whole word and
+    # finditer sees every keyword in the message
+    _RE_KEYWORDS = re.compile(r'\b(' + '|'.join(
+        sorted(set().union(*COMMIT_CATEGORIES.values()))
+    ) + r')\b')
+
     def __init__(self, project_path="."):
         self.project_path = Path(project_path).resolve()
         self.claude_dir = self.project_path / '.claude'
         self.docs_dir = self.project_path / 'docs'
         self.template_dir = Path.home() / '.claude' / 'process-templates-n-prompts' / 'documentation'
-        
+        self._stats_cache = None  # (HEAD sha, stats) from the last gather_project_stats
+        self._file_cache = {}  # path -> content last read or written by this run
+        
+    def _read(self, path):
+        """Read a documentation file, reusing content already seen this run"""
+        content = self._file_cache.get(path)
+        if content is None:
+            content = path.read_text()
+            self._file_cache[path] = content
+        return content
+    
+    def _write(self, path, content):
+        """Write a documentation file unless it already holds this content"""
+        if self._file_cache.get(path) == content:
+            return
+        path.write_text(content)
+        self._file_cache[path] = content
+    
     def get_recent_commits(self, since_hours=24):
         """Get recent commits that might need documentation updates"""
         try:
@@ -64,9 +113,18 @@ class DocumentationAutomator:
             print(f"Error getting recent commits: {e}")
             return []
     
+    def categorize_commit(self, commit):
+        """Classify a commit message once, caching the categories on the commit"""
+        cats = commit.get('_cats')
+        if cats is None:
+            words = set(self._RE_KEYWORDS.findall(commit['message'].lower()))
+            cats = {name for name, keywords in COMMIT_CATEGORIES.items() if words & keywords}
+            commit['_cats'] = cats
+        return cats
+    
     def analyze_commit_for_doc_needs(self, commit):
         """Analyze commit to determine what documentation needs updating"""
-        message = commit['message'].lower()
+        cats = self.categorize_commit(commit)
         
         # Categorize commit types that need documentation
         doc_needs = {
@@ -80,36 +138,36 @@ class DocumentationAutomator:
         }
         
         # Feature commits need multiple documentation updates
-        if re.search(r'\b(feat|feature|add|new)\b', message):
+        if 'feature' in cats:
             doc_needs['roadmap'] = True
             doc_needs['changelog'] = True
             doc_needs['readme'] = True
             
             # API-related features
-            if re.search(r'\b(api|endpoint|route|graphql)\b', message):
+            if 'api' in cats:
                 doc_needs['api_docs'] = True
             
             # User-facing features
-            if re.search(r'\b(ui|ux|user|interface|frontend)\b', message):
+            if 'ui' in cats:
                 doc_needs['user_guide'] = True
         
         # Breaking changes need special attention
-        if re.search(r'\b(break|breaking|major)\b', message):
+        if 'major' in cats:
             doc_needs['api_docs'] = True
             doc_needs['changelog'] = True
             doc_needs['user_guide'] = True
         
         # Architecture/design decisions
-        if re.search(r'\b(architect|design|refactor|restructure)\b', message):
+        if 'architecture' in cats:
             doc_needs['decisions'] = True
             doc_needs['roadmap'] = True
         
         # Deployment/infrastructure changes
-        if re.search(r'\b(deploy|docker|ci|cd|infra|config)\b', message):
+        if 'deployment' in cats:
             doc_needs['deployment'] = True
         
         # Bug fixes might need changelog
-        if re.search(r'\b(fix|bug|issue|patch)\b', message):
+        if 'bugfix' in cats:
             doc_needs['changelog'] = True
         
         return doc_needs
@@ -125,7 +183,7 @@ class DocumentationAutomator:
         # Analyze completed work
         completed_features = []
         for commit in commits:
-            if re.search(r'\b(feat|feature|complete|done|implement)\b', commit['message'].lower()):
+            if 'completed' in self.categorize_commit(commit):
                 completed_features.append({
                     'title': commit['message'],
                     'date': commit['date'],
@@ -176,11 +234,11 @@ This roadmap tracks the evolution of our project from inception to deployment an
 *Automatically updated based on commit history*
 
 """
-        roadmap_file.write_text(template)
+        self._write(roadmap_file, template)
     
     def append_to_roadmap(self, roadmap_file, completed_features):
         """Append completed features to roadmap"""
-        content = roadmap_file.read_text()
+        content = self._read(roadmap_file)
         
         # Find the "Recent Changes" section
         recent_section = "## Recent Changes"
@@ -190,12 +248,13 @@ This roadmap tracks the evolution of our project from inception to deployment an
             for feature in completed_features:
                 new_entries += f"- [{feature['date'][:10]}] {feature['title']} (`{feature['hash']}`)\n"
             
-            content = content.replace(
+            content = splice(
+                content,
                 recent_section + "\n\n*Automatically updated based on commit history*",
                 recent_section + new_entries + "\n*Automatically updated based on commit history*"
             )
             
-            roadmap_file.write_text(content)
+            self._write(roadmap_file, content)
     
     def update_decisions_log(self, commits):
         """Update architectural decisions log"""
@@ -204,7 +263,7 @@ This roadmap tracks the evolution of our project from inception to deployment an
         # Find architecture/design related commits
         design_commits = []
         for commit in commits:
-            if re.search(r'\b(architect|design|refactor|restructure|decision|pattern)\b', commit['message'].lower()):
+            if 'decision' in self.categorize_commit(commit):
                 design_commits.append(commit)
         
         if not design_commits:
@@ -215,8 +274,7 @@ This roadmap tracks the evolution of our project from inception to deployment an
             self.create_initial_decisions_log(decisions_file)
         
         # Add new decisions
-        for commit in design_commits:
-            self.add_decision_entry(decisions_file, commit)
+        self.add_decision_entries(decisions_file, design_commits)
         
         print(f"✅ Updated decisions log with {len(design_commits)} architectural changes")
     
@@ -241,14 +299,24 @@ Each decision follows this structure:
 *Decisions are automatically extracted from commit messages containing architectural keywords*
 
 """
-        decisions_file.write_text(template)
+        self._write(decisions_file, template)
     
-    def add_decision_entry(self, decisions_file, commit):
-        """Add a decision entry to the log"""
-        content = decisions_file.read_text()
+    def add_decision_entries(self, decisions_file, commits):
+        """Add decision entries to the log with a single rewrite"""
+        content = self._read(decisions_file)
+        
+        # Each entry goes directly below the marker, so the last commit is listed first
+        entries = "".join(self.format_decision_entry(commit) for commit in reversed(commits))
         
-        # Create decision entry
-        entry = f"""
+        # Insert before the end of the file
+        marker = "*Decisions are automatically extracted from commit messages containing architectural keywords*"
+        content = splice(content, marker, marker + entries)
+        
+        self._write(decisions_file, content)
+    
+    def format_decision_entry(self, commit):
+        """Format a decision entry for the log"""
+        return f"""
 ### ADR-{commit['hash'][:7]}: {commit['message']}
 
 - **Date**: {commit['date'][:10]}
@@ -262,12 +330,6 @@ Each decision follows this structure:
 
 ---
 """
-        
-        # Insert before the end of the file
-        content = content.replace("*Decisions are automatically extracted from commit messages containing architectural keywords*", 
-                                  "*Decisions are automatically extracted from commit messages containing architectural keywords*" + entry)
-        
-        decisions_file.write_text(content)
     
     def update_changelog(self, commits):
         """Update CHANGELOG.md with recent changes"""
@@ -285,12 +347,12 @@ Each decision follows this structure:
         }
         
         for commit in commits:
-            msg = commit['message'].lower()
-            if re.search(r'\b(break|breaking)\b', msg):
+            cats = self.categorize_commit(commit)
+            if 'breaking' in cats:
                 changes['breaking'].append(commit)
-            elif re.search(r'\b(feat|feature|add|new)\b', msg):
+            elif 'feature' in cats:
                 changes['features'].append(commit)
-            elif re.search(r'\b(fix|bug|patch)\b', msg):
+            elif 'fix' in cats:
                 changes['fixes'].append(commit)
             else:
                 changes['other'].append(commit)
@@ -317,11 +379,11 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
 
 *This changelog is automatically updated based on commit activity*
 """
-        changelog_file.write_text(template)
+        self._write(changelog_file, template)
     
     def add_changelog_entry(self, changelog_file, changes):
         """Add new entry to changelog"""
-        content = changelog_file.read_text()
+        content = self._read(changelog_file)
         
         today = datetime.now().strftime('%Y-%m-%d')
         entry = f"\n## [{today}] - Development Update\n"
@@ -349,12 +411,13 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
         entry += "\n"
         
         # Insert after [Unreleased] section
-        content = content.replace(
+        content = splice(
+            content,
             "## [Unreleased]\n\n### Added\n- Initial project setup\n\n---",
             "## [Unreleased]\n\n### Added\n- Initial project setup\n" + entry + "---"
         )
         
-        changelog_file.write_text(content)
+        self._write(changelog_file, content)
     
     def update_readme_metrics(self):
         """Update README with current project metrics"""
@@ -386,41 +449,40 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
     
     def gather_project_stats(self):
         """Gather current project statistics"""
+        head = collect(spawn(['git', 'rev-parse', 'HEAD'], self.project_path))
+        if head is not None and self._stats_cache and self._stats_cache[0] == head:
+            return dict(self._stats_cache[1])
+        
         stats = {}
         
         try:
-            # Count commits
-            result = subprocess.run(
-                ['git', 'rev-list', '--count', 'HEAD'],
-                capture_output=True, text=True, cwd=self.project_path
-            )
-            if result.returncode == 0:
-                stats['total_commits'] = int(result.stdout.strip())
+            # Count commits, contributors and files concurrently
+            commits = spawn(['git', 'rev-list', '--count', 'HEAD'], self.project_path)
+            contributors = spawn(['git', 'shortlog', '-sn', '--all'], self.project_path)
+            files = spawn(['git', 'ls-files'], self.project_path)
             
-            # Count contributors
-            result = subprocess.run(
-                ['git', 'shortlog', '-sn', '--all'],
-                capture_output=True, text=True, cwd=self.project_path
-            )
-            if result.returncode == 0:
-                stats['contributors'] = len(result.stdout.strip().split('\n'))
+            output = collect(commits)
+            if output is not None:
+                stats['total_commits'] = int(output.strip())
             
-            # Count files
-            result = subprocess.run(
-                ['git', 'ls-files'],
-                capture_output=True, text=True, cwd=self.project_path
-            )
-            if result.returncode == 0:
-                stats['total_files'] = len(result.stdout.strip().split('\n'))
+            output = collect(contributors)
+            if output is not None:
+                stats['contributors'] = len(output.strip().split(b'\n'))
+            
+            output = collect(files)
+            if output is not None:
+                stats['total_files'] = len(output.strip().split(b'\n'))
                 
         except Exception as e:
             print(f"Error gathering stats: {e}")
         
+        if head is not None:
+            self._stats_cache = (head, dict(stats))
         return stats
     
     def update_readme_stats_section(self, readme_file, stats):
         """Update or add stats section to README"""
-        content = readme_file.read_text()
+        content = self._read(readme_file)
         
         stats_section = f"""
 ## 📊 Project Statistics
@@ -446,7 +508,7 @@ and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0
             # Append stats section
             content += stats_section
         
-        readme_file.write_text(content)
+        self._write(readme_file, content)
     
     def trigger_documentation_generation(self):
         """Trigger automated documentation generation"""
@@ -7,6 +7,7 @@ Detects when a branch is ready for PR and suggests creation
 import os
 import sys
 import json
+import time
 import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -17,6 +18,10 @@ sys.path.insert(0, '/Users/umasankrudhya/claude-automations/git-intelligence/src
 from auto_pr import AutoPRManager
 from auto_branching import AutoBranchManager
 
+PR_CACHE_FILE = Path.home() / ".claude" / "pr-detector-cache.json"
+PR_CACHE_TTL = 300  # Seconds a gh pr list answer is reused
+PR_CACHE_MAX_AGE = 24 * 3600  # Expired entries older than this are dropped on save
+
 
 def get_branch_info():
     """Get information about current branch"""
@@ -28,14 +33,25 @@ def get_branch_info():
     }
     
     try:
-        # Get current branch
+        # Current branch, tip commit time and upstream tracking in one call;
+        # --points-at keeps the listing to branches at HEAD
         result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            ["git", "for-each-ref", "--points-at=HEAD",
+             "--format=%(HEAD)|%(committerdate:unix)|%(upstream:track)|%(refname:short)",
+             "refs/heads/"],
             capture_output=True,
             text=True
         )
-        if result.returncode == 0:
-            info["name"] = result.stdout.strip()
+        if result.returncode != 0:
+            return None
+        for line in result.stdout.splitlines():
+            current, timestamp, track, name = line.split("|", 3)
+            if current == "*":
+                break
+        else:
+            # Detached HEAD
+            return None
+        info["name"] = name
         
         # Skip if on main branch
         if info["name"] in ["main", "master", "develop"]:
@@ -43,36 +59,21 @@ def get_branch_info():
         
         # Count commits ahead of main
         result = subprocess.run(
-            ["git", "rev-list", "--count", "HEAD", "^main"],
+            ["git", "rev-list", "--left-right", "--count", "main...HEAD"],
             capture_output=True,
             text=True
         )
         if result.returncode == 0:
-            info["commits"] = int(result.stdout.strip())
+            info["commits"] = int(result.stdout.split()[1])
         
         # Get branch age
-        result = subprocess.run(
-            ["git", "log", "-1", "--format=%ct"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode == 0:
-            timestamp = int(result.stdout.strip())
-            age = datetime.now() - datetime.fromtimestamp(timestamp)
-            info["age_hours"] = age.total_seconds() / 3600
+        age = datetime.now() - datetime.fromtimestamp(int(timestamp))
+        info["age_hours"] = age.total_seconds() / 3600
         
-        # Count unpushed commits
-        try:
-            result = subprocess.run(
-                ["git", "log", f"origin/{info['name']}..HEAD", "--oneline"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                info["unpushed"] = len(result.stdout.strip().split('\n'))
-        except:
-            # Branch might not exist on origin
-            info["unpushed"] = info["commits"]
+        # Count unpushed commits, e.g. "[ahead 2, behind 1]"; empty when the
+        # branch is in sync or has no upstream
+        if track.startswith("[ahead "):
+            info["unpushed"] = int(track[7:-1].split(",")[0])
             
     except:
         return None
@@ -96,8 +97,38 @@ def should_suggest_pr(branch_info):
     return sum(criteria) >= 2
 
 
+def _load_cache():
+    """PR lookups cached by earlier runs, as {key: [pr_exists, expires_at]}"""
+    try:
+        with open(PR_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    """Write the PR lookup cache, dropping long-expired entries"""
+    cutoff = time.time() - PR_CACHE_MAX_AGE
+    cache = {key: entry for key, entry in cache.items() if entry[1] > cutoff}
+    try:
+        PR_CACHE_FILE.parent.mkdir(exist_ok=True)
+        tmp_file = PR_CACHE_FILE.with_name(f"{PR_CACHE_FILE.name}.{os.getpid()}")
+        with open(tmp_file, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, PR_CACHE_FILE)
+    except OSError:
+        pass
+
+
 def check_pr_exists(branch_name):
     """Check if PR already exists for branch"""
+    # Branch names repeat across repositories, so the key includes the directory
+    key = f"{os.getcwd()}|{branch_name}"
+    cache = _load_cache()
+    entry = cache.get(key)
+    if entry and entry[1] > time.time():
+        return entry[0]
+    
     try:
         result = subprocess.run(
             ["gh", "pr", "list", "--head", branch_name, "--json", "number"],
@@ -107,6 +138,8 @@ def check_pr_exists(branch_name):
         
         if result.returncode == 0:
             prs = json.loads(result.stdout)
+            cache[key] = [len(prs) > 0, time.time() + PR_CACHE_TTL]
+            _save_cache(cache)
             return len(prs) > 0
     except:
         pass
@@ -151,7 +184,7 @@ def main():
             
             # Log the suggestion
             log_entry = {
-                "timestamp": subprocess.run(["date", "-Iseconds"], capture_output=True, text=True).stdout.strip(),
+                "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
                 "action": "pr_suggestion",
                 "branch": branch_info["name"],
                 "stats": {
@@ -27,6 +27,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The format has no file/line fields, so skip the caller frame lookup per record
+logging._srcfile = None
+
 def get_hook_input():
     """Read hook input from stdin"""
     try:
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+PRISM Daemon - Part of PRISM
+
+Long-lived helper for the context DNA loader hook. Imports ContextDNAProfiler
+and loads the DNA profiles once, then answers context requests over a Unix
+domain socket so each hook invocation skips the import and profile load.
+
+Protocol: one JSON line per connection.
+    request:  {"agent": "<agent_type>", "task": "<task description>"}
+    response: {"context_package": {...}, "max_context_kb": <int>}
+              or {"error": "<message>"}
+"""
+
+import os
+import sys
+import json
+import fcntl
+import signal
+import socket
+import socketserver
+from pathlib import Path
+
+# Add git-intelligence src to path
+sys.path.append(str(Path.home() / 'claude-automations' / 'git-intelligence' / 'src'))
+
+SOCKET_PATH = Path.home() / '.claude' / 'prism.sock'
+LOCK_PATH = SOCKET_PATH.with_suffix('.lock')  # Held by the running daemon for its lifetime
+IDLE_TIMEOUT = 3600  # Exit after an hour without requests
+
+
+class PrismRequestHandler(socketserver.StreamRequestHandler):
+    """Serve a single context request from the hook client"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.get_context(request['agent'], request['task'])
+        except Exception as e:
+            response = {'error': str(e)}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class PrismServer(socketserver.UnixStreamServer):
+    """Unix socket server holding a warm ContextDNAProfiler"""
+
+    timeout = IDLE_TIMEOUT
+
+    def __init__(self, socket_path, profiler):
+        self.profiler = profiler
+        self.profiles_file = profiler.profiles_dir / 'profiles.json'
+        self.profiles_mtime = self.read_profiles_mtime()
+        self.idle = False
+        super().__init__(str(socket_path), PrismRequestHandler)
+
+    def read_profiles_mtime(self):
+        """mtime of profiles.json, or None when it does not exist"""
+        try:
+            return os.stat(self.profiles_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def get_context(self, agent_type, task):
+        profiler = self.profiler
+
+        # Other ContextDNAProfiler users (including the hook's local fallback)
+        # also save profiles.json; pick up their changes before writing over it
+        if self.read_profiles_mtime() != self.profiles_mtime:
+            profiler.profiles = profiler.load_profiles()
+
+        context_package = profiler.get_optimal_context(agent_type, task)
+        profile = profiler.profiles.get(agent_type, profiler.profiles['general'])
+
+        # Save usage statistics for learning
+        profiler.save_profiles()
+        self.profiles_mtime = self.read_profiles_mtime()
+
+        return {
+            'context_package': context_package,
+            'max_context_kb': profile.max_context_kb,
+        }
+
+    def handle_timeout(self):
+        self.idle = True
+
+
+def daemon_running(socket_path) -> bool:
+    """Check whether another daemon is already answering on the socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def main():
+    """Main entry point"""
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    # Only one daemon may own the socket; a second one started at the same
+    # time would otherwise unlink the first one's socket and orphan it
+    lock_file = open(LOCK_PATH, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return
+
+    try:
+        if daemon_running(SOCKET_PATH):
+            return
+
+        from context_dna import ContextDNAProfiler
+
+        # Remove a stale socket left behind by a daemon that did not shut down cleanly
+        try:
+            SOCKET_PATH.unlink()
+        except FileNotFoundError:
+            pass
+
+        server = PrismServer(SOCKET_PATH, ContextDNAProfiler())
+        os.chmod(SOCKET_PATH, 0o600)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while not server.idle:
+                server.handle_request()
+        finally:
+            server.server_close()
+            try:
+                SOCKET_PATH.unlink()
+            except FileNotFoundError:
+                pass
+    finally:
+        lock_file.close()
+
+
+if __name__ == "__main__":
+    main()
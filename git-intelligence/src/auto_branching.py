@@ -71,13 +71,13 @@ class AutoBranchManager:
             return max(scores, key=scores.get)
         return "feature"
         
-    def should_create_branch(self, context: Dict) -> bool:
+    def should_create_branch(self, context: Dict, current_branch: Optional[str] = None) -> bool:
         """Determine if a new branch should be created"""
         if not self.config["auto_branch"]:
             return False
             
         # Check if we're on main/master
-        current_branch = self.get_current_branch()
+        current_branch = current_branch or self.get_current_branch()
         if current_branch not in ["main", "master", "develop"]:
             return False
             
@@ -220,12 +220,12 @@ class AutoBranchManager:
         except:
             return False
             
-    def auto_branch(self, context: Dict) -> Optional[str]:
+    def auto_branch(self, context: Dict, current_branch: Optional[str] = None) -> Optional[str]:
         """Main auto-branching logic"""
         start_time = time.time()
         
         try:
-            if not self.should_create_branch(context):
+            if not self.should_create_branch(context, current_branch):
                 track_feature_usage("auto_branch", start_time, True, {"reason": "not_needed"})
                 return None
                 
@@ -247,9 +247,9 @@ class AutoBranchManager:
             
         return None
         
-    def suggest_branch_merge(self) -> Optional[Dict]:
+    def suggest_branch_merge(self, current_branch: Optional[str] = None) -> Optional[Dict]:
         """Suggest when a branch might be ready to merge"""
-        current_branch = self.get_current_branch()
+        current_branch = current_branch or self.get_current_branch()
         
         if current_branch in ["main", "master", "develop"]:
             return None
@@ -175,19 +175,24 @@ class ContextDNAProfiler:
     
     def load_manifest(self, manifest_name: str) -> Optional[Dict]:
         """Load a specific manifest from cache or disk"""
-        # Check cache first
-        if manifest_name in self.manifest_cache:
-            return self.manifest_cache[manifest_name]
-        
-        # Try to load from disk
         manifest_path = Path.home() / '.claude' / 'manifests' / f'{manifest_name}.json'
-        if manifest_path.exists():
-            try:
-                data = json.loads(manifest_path.read_text())
-                self.manifest_cache[manifest_name] = data
-                return data
-            except Exception as e:
-                print(f"[PRISM] Error loading manifest {manifest_name}: {e}")
+        try:
+            mtime_ns = manifest_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        
+        # Check cache first (a long-lived profiler must see rewritten manifests)
+        cached = self.manifest_cache.get(manifest_name)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        # Load from disk
+        try:
+            data = json.loads(manifest_path.read_text())
+            self.manifest_cache[manifest_name] = (mtime_ns, data)
+            return data
+        except Exception as e:
+            print(f"[PRISM] Error loading manifest {manifest_name}: {e}")
         
         return None
     